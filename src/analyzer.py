@@ -1,13 +1,26 @@
 """OpenAI GPT-4 Vision integration for screenshot analysis."""
 
 import base64
+import binascii
+import hashlib
+import io
 import json
 import logging
+import os
+import re
+import tempfile
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Literal
+from typing import TYPE_CHECKING, BinaryIO, Literal
 
-from openai import OpenAI
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, fall back to the stdlib parser
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -71,8 +84,16 @@ Respond in this exact JSON format:
 }
 """
 
+# Prebuilt prompt message parts keyed by content type override. They are
+# shared between requests and must never be mutated.
+_PROMPT_PARTS = {
+    None: {"type": "text", "text": AUTO_DETECT_PROMPT},
+    "text": {"type": "text", "text": ANALYSIS_PROMPT},
+    "graphic": {"type": "text", "text": GRAPHIC_ANALYSIS_PROMPT},
+}
+
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     """Result of screenshot analysis."""
 
@@ -91,26 +112,293 @@ _MIME_TYPES = {
     ".jpeg": "image/jpeg",
 }
 
+# Precomputed data URL headers per extension
+_DATA_URL_PREFIXES = {
+    ext: f"data:{mime};base64,".encode("ascii") for ext, mime in _MIME_TYPES.items()
+}
+_DEFAULT_DATA_URL_PREFIX = b"data:image/png;base64,"
+
+# Longest edge sent to the API; high-detail vision input is scaled to fit
+# 2048x2048 server-side, so larger images only add upload size
+_MAX_UPLOAD_EDGE = 2048
+
+# Read size for streaming base64; a multiple of 3 so chunks encode without padding
+_B64_CHUNK_SIZE = 54 * 1024
+
+# Characters that change state while scanning for a JSON object
+_JSON_TOKEN_RE = re.compile(r'[{}"\\]')
+
+
+def __getattr__(name: str):
+    """Import the OpenAI client classes on first use (PEP 562).
+
+    ``openai`` takes most of a second to import, which CLI commands that
+    never call the API should not pay for.
+    """
+    if name in ("OpenAI", "AsyncOpenAI"):
+        import openai
+
+        value = getattr(openai, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _client_class(name: str):
+    """Resolve an OpenAI client class through the lazy module attribute."""
+    return globals().get(name) or __getattr__(name)
+
+
+def _json_loads(data: str | bytes):
+    """Parse JSON with orjson when installed, otherwise the stdlib.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+    catch the same exceptions either way.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
 
 class ScreenshotAnalyzer:
     """Analyzes screenshots using OpenAI GPT-4 Vision."""
 
-    def __init__(self, api_key: str, model: str = "gpt-4o", max_tokens: int = 4096):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o",
+        max_tokens: int = 4096,
+        cache_dir: Path | None = None,
+        optimize_png: bool = False,
+    ):
         """Initialize the analyzer.
 
         Args:
             api_key: OpenAI API key
             model: Model to use for analysis
             max_tokens: Maximum tokens for response
+            cache_dir: Folder for cached responses keyed by image content hash,
+                or None to disable caching
+            optimize_png: Re-compress PNGs and strip metadata before upload
         """
-        self.client = OpenAI(api_key=api_key)
+        self.client = _client_class("OpenAI")(api_key=api_key)
         self.model = model
         self.max_tokens = max_tokens
+        self.cache_dir = cache_dir
+        self.optimize_png = optimize_png
+        self._api_key = api_key
+        self._async_client: "AsyncOpenAI | None" = None
+
+    @property
+    def async_client(self) -> "AsyncOpenAI":
+        """Lazily created async client, only needed for concurrent analysis."""
+        if self._async_client is None:
+            self._async_client = _client_class("AsyncOpenAI")(api_key=self._api_key)
+        return self._async_client
+
+    def _build_data_url(
+        self,
+        image_path: Path,
+        image_mime_type: str | None = None,
+        hasher=None,
+        image_bytes: bytes | None = None,
+    ) -> str:
+        """Build a base64 ``data:`` URL for an image in one streaming read.
+
+        The encoding is written chunk by chunk into a single preallocated
+        buffer, so only the buffer and the final string are ever full-size.
+        The MIME type defaults to one derived from the file extension. If a
+        ``hashlib`` object is given it is fed the same chunks, so hashing
+        needs no second read. ``image_bytes`` are encoded instead of the file.
+        """
+        if image_mime_type is None:
+            header = _DATA_URL_PREFIXES.get(
+                image_path.suffix.lower(), _DEFAULT_DATA_URL_PREFIX
+            )
+        else:
+            header = f"data:{image_mime_type};base64,".encode("ascii")
+
+        if image_bytes is not None:
+            if hasher is not None:
+                hasher.update(image_bytes)
+            encoded = binascii.b2a_base64(image_bytes, newline=False)
+            return (header + encoded).decode("ascii")
+
+        size = image_path.stat().st_size
+        out = bytearray(len(header) + (size + 2) // 3 * 4)
+        out[: len(header)] = header
+        pos = len(header)
 
-    def _encode_image(self, image_path: Path) -> str:
-        """Encode image to base64 string."""
         with open(image_path, "rb") as f:
-            return base64.standard_b64encode(f.read()).decode("utf-8")
+            while chunk := f.read(_B64_CHUNK_SIZE):
+                if hasher is not None:
+                    hasher.update(chunk)
+                encoded = binascii.b2a_base64(chunk, newline=False)
+                out[pos : pos + len(encoded)] = encoded
+                pos += len(encoded)
+
+        # Trim in case the file shrank between stat() and read()
+        del out[pos:]
+        return out.decode("ascii")
+
+    def _reencoded_data_url(
+        self,
+        image_path: Path,
+        content_type_override: Literal["text", "graphic"] | None,
+        image_bytes: bytes | None = None,
+    ) -> str | None:
+        """Return a data URL for a smaller re-encoded copy of the image.
+
+        Oversized images are resized to fit ``_MAX_UPLOAD_EDGE``. JPEG
+        sources stay JPEG and so does RGB graphic content; everything else is
+        re-encoded as PNG so OCR is not affected by compression artifacts. If
+        ``optimize_png`` is set, PNGs within the size limit are re-compressed
+        with metadata stripped. Either way the copy is used only if it is at
+        least 10% smaller than the original.
+
+        Returns None when the original file should be sent as-is, including
+        when Pillow cannot read it. ``image_bytes`` are read instead of the
+        file when given.
+        """
+        # Only needed for oversized or optimized uploads, so keep Pillow out
+        # of CLI startup
+        from PIL import Image
+
+        source = image_path if image_bytes is None else io.BytesIO(image_bytes)
+        try:
+            with Image.open(source) as img:
+                oversized = max(img.size) > _MAX_UPLOAD_EDGE
+                if not oversized and not (self.optimize_png and img.format == "PNG"):
+                    return None
+
+                source_format = img.format
+                img.info.pop("icc_profile", None)
+                buf = io.BytesIO()
+                if oversized:
+                    img.thumbnail(
+                        (_MAX_UPLOAD_EDGE, _MAX_UPLOAD_EDGE), Image.Resampling.LANCZOS
+                    )
+                if source_format == "JPEG" or (
+                    oversized and content_type_override == "graphic" and img.mode == "RGB"
+                ):
+                    # JPEG sources are already lossy, but text keeps a
+                    # higher quality for OCR
+                    quality = 85 if content_type_override == "graphic" else 90
+                    img.save(buf, format="JPEG", quality=quality, optimize=True)
+                    mime = "image/jpeg"
+                else:
+                    img.save(buf, format="PNG", optimize=True)
+                    mime = "image/png"
+        except (OSError, ValueError) as e:
+            logger.debug(f"Sending {image_path.name} unmodified: {e}")
+            return None
+
+        data = buf.getvalue()
+        if image_bytes is None:
+            original_size = image_path.stat().st_size
+        else:
+            original_size = len(image_bytes)
+        if len(data) >= original_size * 0.9:
+            return None
+
+        logger.info(
+            f"Re-encoded {image_path.name} for upload "
+            f"({img.size[0]}x{img.size[1]}, {len(data)} bytes)"
+        )
+        return f"data:{mime};base64," + base64.b64encode(data).decode("ascii")
+
+    def _image_data_url(
+        self,
+        image_path: Path,
+        content_type_override: Literal["text", "graphic"] | None = None,
+        image_mime_type: str | None = None,
+        hasher=None,
+        image_bytes: bytes | None = None,
+    ) -> str:
+        """Return the data URL to upload, re-encoding the image if worthwhile.
+
+        If a ``hashlib`` object is given it is fed the original image bytes.
+        """
+        data_url = self._reencoded_data_url(
+            image_path, content_type_override, image_bytes
+        )
+        if data_url is None:
+            return self._build_data_url(
+                image_path, image_mime_type, hasher, image_bytes
+            )
+
+        if hasher is not None and image_bytes is not None:
+            hasher.update(image_bytes)
+        elif hasher is not None:
+            with open(image_path, "rb") as f:
+                while chunk := f.read(_B64_CHUNK_SIZE):
+                    hasher.update(chunk)
+        return data_url
+
+    def _encode_and_hash(
+        self,
+        image_path: Path,
+        image_mime_type: str | None = None,
+        content_type_override: Literal["text", "graphic"] | None = None,
+        image_bytes: bytes | None = None,
+    ) -> tuple[str, str]:
+        """Return the image's data URL and SHA-256 hex digest of the file.
+
+        The hash is always of the original image so cache keys are stable.
+        """
+        hasher = hashlib.sha256()
+        data_url = self._image_data_url(
+            image_path, content_type_override, image_mime_type, hasher, image_bytes
+        )
+        return data_url, hasher.hexdigest()
+
+    def _cache_path(
+        self,
+        image_hash: str,
+        content_type_override: Literal["text", "graphic"] | None,
+    ) -> Path | None:
+        """Return the cache file for an image hash and prompt, if caching is on."""
+        if self.cache_dir is None:
+            return None
+        prompt_tag = content_type_override or "auto"
+        return self.cache_dir / f"{image_hash}_{self.model}_{prompt_tag}.json"
+
+    def _load_cached(self, cache_path: Path | None) -> str | None:
+        """Return cached raw model output, or None on a miss."""
+        if cache_path is None or not cache_path.exists():
+            return None
+        try:
+            return json.loads(cache_path.read_text(encoding="utf-8"))["content"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {cache_path.name}: {e}")
+            return None
+
+    def _store_cached(self, cache_path: Path | None, raw_content: str) -> None:
+        """Atomically write raw model output to the cache."""
+        if cache_path is None or not raw_content:
+            return
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # A temp file per writer, since the same image may be analyzed
+            # by several threads at once
+            fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {cache_path.name}: {e}")
+            return
+        try:
+            with open(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"content": raw_content}))
+            os.replace(tmp_name, cache_path)
+        except OSError as e:
+            Path(tmp_name).unlink(missing_ok=True)
+            logger.warning(f"Failed to write cache entry {cache_path.name}: {e}")
 
     def _parse_response(self, content: str, max_categories: int) -> tuple[str, list[str]]:
         """Parse the JSON response from the API.
@@ -137,17 +425,54 @@ class ScreenshotAnalyzer:
             return content, ["Uncategorized"]
 
     def _extract_json(self, content: str) -> dict:
-        """Extract JSON from raw API response content, handling markdown wrapping."""
-        if "```json" in content:
-            start = content.index("```json") + 7
-            end = content.index("```", start)
-            content = content[start:end].strip()
-        elif "```" in content:
-            start = content.index("```") + 3
-            end = content.index("```", start)
-            content = content[start:end].strip()
-
-        return json.loads(content)
+        """Extract the JSON object from raw API response content.
+
+        Scans forward from the first ``{`` tracking brace depth outside string
+        literals, so markdown fences and surrounding prose are skipped without
+        any special-casing. If the first balanced object is not valid JSON
+        (e.g. a brace in leading prose), the scan resumes at the next ``{``.
+        """
+        start = content.find("{")
+        while start != -1:
+            end = self._match_braces(content, start)
+            if end == -1:
+                break
+            try:
+                return _json_loads(content[start:end])
+            except ValueError:
+                start = content.find("{", start + 1)
+
+        raise ValueError("No JSON object found in response")
+
+    @staticmethod
+    def _match_braces(content: str, start: int) -> int:
+        """Return the index just past the brace closing ``content[start]``, or -1."""
+        depth = 0
+        in_string = False
+        escaped_pos = -1
+
+        # Only braces, quotes and backslashes affect the state; the regex
+        # skips everything else at C speed.
+        for match in _JSON_TOKEN_RE.finditer(content, start):
+            pos = match.start()
+            char = match.group()
+            if in_string:
+                if pos == escaped_pos:
+                    continue
+                if char == "\\":
+                    escaped_pos = pos + 1
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    return pos + 1
+
+        return -1
 
     def _parse_auto_response(
         self, content: str, max_categories: int
@@ -198,62 +523,46 @@ class ScreenshotAnalyzer:
             logger.warning(f"Failed to parse graphic response: {e}")
             return content, ["Uncategorized"]
 
-    def analyze(
+    def _build_messages(
         self,
         image_path: Path,
-        max_categories: int = 2,
-        content_type_override: Literal["text", "graphic"] | None = None,
+        content_type_override: Literal["text", "graphic"] | None,
         image_mime_type: str | None = None,
-    ) -> AnalysisResult:
-        """Analyze a screenshot image.
-
-        Args:
-            image_path: Path to the image file
-            max_categories: Maximum number of categories to extract
-            content_type_override: Force "text" or "graphic" mode, or None for auto-detect
-            image_mime_type: MIME type override (defaults based on file extension)
+        data_url: str | None = None,
+    ) -> list[dict]:
+        """Build the chat messages payload for a single image.
 
-        Returns:
-            AnalysisResult with extracted text/description and categories
+        ``data_url`` may be passed when the image has already been encoded.
         """
-        logger.info(f"Analyzing image: {image_path.name}")
-
-        # Determine MIME type
-        if image_mime_type is None:
-            image_mime_type = _MIME_TYPES.get(image_path.suffix.lower(), "image/png")
-
-        base64_image = self._encode_image(image_path)
+        if data_url is None:
+            data_url = self._image_data_url(
+                image_path, content_type_override, image_mime_type
+            )
 
-        # Choose prompt based on content type
-        if content_type_override == "graphic":
-            prompt = GRAPHIC_ANALYSIS_PROMPT
-        elif content_type_override == "text":
-            prompt = ANALYSIS_PROMPT
-        else:
-            prompt = AUTO_DETECT_PROMPT
-
-        response = self.client.chat.completions.create(
-            model=self.model,
-            max_tokens=self.max_tokens,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": prompt},
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:{image_mime_type};base64,{base64_image}",
-                                "detail": "high",
-                            },
+        return [
+            {
+                "role": "user",
+                "content": [
+                    _PROMPT_PARTS.get(content_type_override, _PROMPT_PARTS[None]),
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": data_url,
+                            "detail": "high",
                         },
-                    ],
-                }
-            ],
-        )
-
-        raw_content = response.choices[0].message.content or ""
+                    },
+                ],
+            }
+        ]
 
+    def _build_result(
+        self,
+        image_path: Path,
+        raw_content: str,
+        max_categories: int,
+        content_type_override: Literal["text", "graphic"] | None,
+    ) -> AnalysisResult:
+        """Turn raw model output into an AnalysisResult."""
         if content_type_override == "graphic":
             description, categories = self._parse_graphic_response(
                 raw_content, max_categories
@@ -294,3 +603,290 @@ class ScreenshotAnalyzer:
                 description=description,
                 source_image_path=image_path if content_type == "graphic" else None,
             )
+
+    def analyze(
+        self,
+        image_path: Path,
+        max_categories: int = 2,
+        content_type_override: Literal["text", "graphic"] | None = None,
+        image_mime_type: str | None = None,
+        image_bytes: bytes | None = None,
+    ) -> AnalysisResult:
+        """Analyze a screenshot image.
+
+        Args:
+            image_path: Path to the image file
+            max_categories: Maximum number of categories to extract
+            content_type_override: Force "text" or "graphic" mode, or None for auto-detect
+            image_mime_type: MIME type override (defaults based on file extension)
+            image_bytes: Encoded image to analyze instead of reading image_path,
+                which then only names the image (extension, logs, result); the
+                file need not exist
+
+        Returns:
+            AnalysisResult with extracted text/description and categories
+        """
+        logger.info(f"Analyzing image: {image_path.name}")
+
+        data_url, image_hash = self._encode_and_hash(
+            image_path, image_mime_type, content_type_override, image_bytes
+        )
+        cache_path = self._cache_path(image_hash, content_type_override)
+        raw_content = self._load_cached(cache_path)
+
+        if raw_content is not None:
+            logger.info(f"Using cached analysis for {image_path.name}")
+        else:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                max_tokens=self.max_tokens,
+                messages=self._build_messages(
+                    image_path, content_type_override, data_url=data_url
+                ),
+                # Sent as a raw field: older openai releases reject the keyword
+                extra_body={"prompt_cache_key": image_hash},
+            )
+
+            raw_content = response.choices[0].message.content or ""
+            self._store_cached(cache_path, raw_content)
+
+        return self._build_result(
+            image_path, raw_content, max_categories, content_type_override
+        )
+
+    async def analyze_async(
+        self,
+        image_path: Path,
+        max_categories: int = 2,
+        content_type_override: Literal["text", "graphic"] | None = None,
+        image_mime_type: str | None = None,
+    ) -> AnalysisResult:
+        """Async variant of analyze() using the AsyncOpenAI client.
+
+        Rate-limit (429) and transient errors are retried by the client with
+        exponential backoff, honouring the server's ``retry-after`` header.
+        """
+        import asyncio
+
+        logger.info(f"Analyzing image: {image_path.name}")
+
+        # File reads and writes run in threads so a large image does not
+        # stall the other requests in flight
+        data_url, image_hash = await asyncio.to_thread(
+            self._encode_and_hash, image_path, image_mime_type, content_type_override
+        )
+        cache_path = self._cache_path(image_hash, content_type_override)
+        raw_content = await asyncio.to_thread(self._load_cached, cache_path)
+
+        if raw_content is not None:
+            logger.info(f"Using cached analysis for {image_path.name}")
+        else:
+            response = await self.async_client.chat.completions.create(
+                model=self.model,
+                max_tokens=self.max_tokens,
+                messages=self._build_messages(
+                    image_path, content_type_override, data_url=data_url
+                ),
+                extra_body={"prompt_cache_key": image_hash},
+            )
+
+            raw_content = response.choices[0].message.content or ""
+            await asyncio.to_thread(self._store_cached, cache_path, raw_content)
+
+        return self._build_result(
+            image_path, raw_content, max_categories, content_type_override
+        )
+
+    async def analyze_many(
+        self,
+        image_paths: list[Path],
+        max_categories: int = 2,
+        content_type_override: Literal["text", "graphic"] | None = None,
+        concurrency: int = 8,
+    ) -> list[AnalysisResult | BaseException]:
+        """Analyze several images concurrently.
+
+        Args:
+            image_paths: Image files to analyze
+            max_categories: Maximum number of categories to extract
+            content_type_override: Force "text" or "graphic" mode, or None for auto-detect
+            concurrency: Maximum number of requests in flight at once
+
+        Returns:
+            One entry per input path, in order: the AnalysisResult, or the
+            exception raised while analyzing that image
+        """
+        import asyncio
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _bounded(image_path: Path) -> AnalysisResult:
+            async with semaphore:
+                return await self.analyze_async(
+                    image_path, max_categories, content_type_override
+                )
+
+        return await asyncio.gather(
+            *(_bounded(p) for p in image_paths), return_exceptions=True
+        )
+
+
+class BatchScreenshotAnalyzer(ScreenshotAnalyzer):
+    """Analyzes many screenshots at once through the OpenAI Batch API.
+
+    Batch jobs are billed at a reduced rate but may take up to 24h to
+    complete, so this is meant for non-interactive folder processing.
+    The synchronous ``analyze()`` remains available for interactive use.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o",
+        max_tokens: int = 4096,
+        poll_interval: float = 30.0,
+    ):
+        """Initialize the batch analyzer.
+
+        Args:
+            api_key: OpenAI API key
+            model: Model to use for analysis
+            max_tokens: Maximum tokens for response
+            poll_interval: Seconds between batch status checks
+        """
+        super().__init__(api_key=api_key, model=model, max_tokens=max_tokens)
+        self.poll_interval = poll_interval
+
+    def write_batch_jsonl(
+        self,
+        image_paths: list[Path],
+        out_file: BinaryIO,
+        content_type_override: Literal["text", "graphic"] | None = None,
+    ) -> None:
+        """Write one chat completion request per image to a JSONL stream.
+
+        Lines are serialized straight to bytes and written one at a time, so
+        only a single image's payload is in memory at once. Each line uses
+        the image filename as its ``custom_id``.
+        """
+        for image_path in image_paths:
+            request = {
+                "custom_id": image_path.name,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "max_tokens": self.max_tokens,
+                    "messages": self._build_messages(
+                        image_path, content_type_override
+                    ),
+                },
+            }
+            out_file.write(_json_dumps(request))
+            out_file.write(b"\n")
+
+    def submit(
+        self,
+        image_paths: list[Path],
+        content_type_override: Literal["text", "graphic"] | None = None,
+    ) -> str:
+        """Upload a batch request file and create the batch job.
+
+        Returns:
+            ID of the created batch
+        """
+        # Spool to disk rather than memory: the file holds every image's base64
+        with tempfile.TemporaryFile() as payload:
+            self.write_batch_jsonl(image_paths, payload, content_type_override)
+            payload.seek(0)
+            batch_file = self.client.files.create(
+                file=("screenshot_batch.jsonl", payload), purpose="batch"
+            )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info(f"Submitted batch {batch.id} with {len(image_paths)} image(s)")
+        return batch.id
+
+    def wait(self, batch_id: str):
+        """Poll a batch until it reaches a terminal state.
+
+        Returns:
+            The completed batch object
+
+        Raises:
+            RuntimeError: If the batch failed, expired or was cancelled
+        """
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status == "completed":
+                return batch
+            if batch.status in ("failed", "expired", "cancelled"):
+                raise RuntimeError(f"Batch {batch_id} ended with status: {batch.status}")
+            logger.info(f"Batch {batch_id} status: {batch.status}")
+            time.sleep(self.poll_interval)
+
+    def collect(
+        self,
+        batch,
+        image_paths: list[Path],
+        max_categories: int = 2,
+        content_type_override: Literal["text", "graphic"] | None = None,
+    ) -> dict[str, AnalysisResult]:
+        """Download a completed batch's output and parse each response.
+
+        Returns:
+            Mapping of source filename to AnalysisResult. Requests that
+            errored inside the batch are omitted.
+        """
+        paths_by_id = {p.name: p for p in image_paths}
+        results: dict[str, AnalysisResult] = {}
+
+        if not batch.output_file_id:
+            return results
+
+        output = self.client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            entry = _json_loads(line)
+            custom_id = entry.get("custom_id")
+            image_path = paths_by_id.get(custom_id)
+            response = entry.get("response") or {}
+
+            if image_path is None or response.get("status_code") != 200:
+                logger.warning(f"Batch request failed for {custom_id}: {entry.get('error')}")
+                continue
+
+            choices = response["body"].get("choices") or [{}]
+            raw_content = choices[0].get("message", {}).get("content") or ""
+            results[custom_id] = self._build_result(
+                image_path, raw_content, max_categories, content_type_override
+            )
+
+        return results
+
+    def analyze_batch(
+        self,
+        image_paths: list[Path],
+        max_categories: int = 2,
+        content_type_override: Literal["text", "graphic"] | None = None,
+    ) -> dict[str, AnalysisResult]:
+        """Submit images as one batch job, wait for it and parse the results.
+
+        Args:
+            image_paths: Image files to analyze
+            max_categories: Maximum number of categories to extract
+            content_type_override: Force "text" or "graphic" mode, or None for auto-detect
+
+        Returns:
+            Mapping of source filename to AnalysisResult
+        """
+        if not image_paths:
+            return {}
+
+        batch_id = self.submit(image_paths, content_type_override)
+        batch = self.wait(batch_id)
+        return self.collect(batch, image_paths, max_categories, content_type_override)
@@ -1,13 +1,30 @@
 """Configuration management for Screenshot Wizard."""
 
+import copy
 import os
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 import yaml
 from dotenv import load_dotenv
 
+try:
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without LibYAML
+    from yaml import SafeDumper as _YamlDumper
+    from yaml import SafeLoader as _YamlLoader
+
+# Project root (parent of the src directory)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
 SUPPORTED_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".pdf"})
+# Same extensions as a tuple for str.endswith() on lowercased filenames
+SUPPORTED_SUFFIXES = tuple(sorted(SUPPORTED_EXTENSIONS))
+
+# Parsed settings per file, invalidated when its mtime or size changes
+_YAML_CACHE: dict[Path, tuple[tuple[int, int], dict[str, Any]]] = {}
 
 
 class Config:
@@ -22,8 +39,7 @@ class Config:
         # Load environment variables from .env file
         load_dotenv()
 
-        # Determine project root (parent of src directory)
-        self.project_root = Path(__file__).parent.parent
+        self.project_root = PROJECT_ROOT
 
         # Load YAML configuration
         if config_path is None:
@@ -36,12 +52,25 @@ class Config:
         self._validate_api_key()
 
     def _load_yaml(self, path: Path) -> dict[str, Any]:
-        """Load settings from YAML file."""
-        if not path.exists():
+        """Load settings from YAML file.
+
+        Parsed settings are shared across Config instances until the file's
+        mtime changes; each instance gets its own copy to mutate.
+        """
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
             return self._default_settings()
 
-        with open(path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or self._default_settings()
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = _YAML_CACHE.get(path)
+        if cached is None or cached[0] != version:
+            with open(path, "rb") as f:
+                settings = yaml.load(f, Loader=_YamlLoader) or self._default_settings()
+            cached = (version, settings)
+            _YAML_CACHE[path] = cached
+
+        return copy.deepcopy(cached[1])
 
     def _default_settings(self) -> dict[str, Any]:
         """Return default settings if YAML file is missing."""
@@ -50,20 +79,25 @@ class Config:
                 "input": "./input",
                 "output": "./output",
                 "archive": "./archive",
+                "cache": "./cache",
             },
             "processing": {
                 "polling_interval": 5,
                 "max_categories": 2,
+                "concurrency": 8,
+                "use_polling": "auto",
             },
             "pdf": {
                 "page_size": "A4",
                 "font_family": "Helvetica",
                 "font_size": 11,
                 "margin": 72,
+                "analyze_dpi": 150,
             },
             "openai": {
                 "model": "gpt-4o",
                 "max_tokens": 4096,
+                "optimize_png": False,
             },
         }
 
@@ -78,52 +112,83 @@ class Config:
 
     def _resolve_path(self, path_str: str) -> Path:
         """Resolve a path relative to project root."""
-        path = Path(path_str)
-        if path.is_absolute():
-            return path
-        return self.project_root / path
+        if os.path.isabs(path_str):
+            return Path(path_str)
+        return self.project_root / path_str
 
     @property
     def openai_api_key(self) -> str | None:
         """Get OpenAI API key from environment."""
         return os.getenv("OPENAI_API_KEY")
 
-    @property
+    @cached_property
     def input_folder(self) -> Path:
         """Get input folder path."""
         return self._resolve_path(self._settings["folders"]["input"])
 
-    @property
+    @cached_property
     def output_folder(self) -> Path:
         """Get output folder path."""
         return self._resolve_path(self._settings["folders"]["output"])
 
-    @property
+    @cached_property
     def archive_folder(self) -> Path:
         """Get archive folder path."""
         return self._resolve_path(self._settings["folders"]["archive"])
 
-    @property
+    @cached_property
+    def cache_folder(self) -> Path | None:
+        """Get analysis cache folder path, or None if caching is disabled."""
+        cache = self._settings["folders"].get("cache")
+        if not cache:
+            return None
+        return self._resolve_path(cache)
+
+    @cached_property
     def polling_interval(self) -> int:
         """Get polling interval in seconds."""
         return self._settings["processing"]["polling_interval"]
 
-    @property
+    @cached_property
     def max_categories(self) -> int:
         """Get maximum number of categories."""
         return self._settings["processing"]["max_categories"]
 
-    @property
+    @cached_property
+    def concurrency(self) -> int:
+        """Get the number of files, or pages of a PDF, processed in parallel."""
+        return self._settings["processing"].get("concurrency", 8)
+
+    @cached_property
+    def use_polling(self) -> bool | None:
+        """Whether to poll the input folder instead of using OS notifications.
+
+        None ("auto") leaves it to the watcher, which polls network mounts.
+        """
+        value = self._settings["processing"].get("use_polling", "auto")
+        return None if value in (None, "auto") else bool(value)
+
+    @cached_property
     def openai_model(self) -> str:
         """Get OpenAI model name."""
         return self._settings["openai"]["model"]
 
-    @property
+    @cached_property
     def openai_max_tokens(self) -> int:
         """Get OpenAI max tokens."""
         return self._settings["openai"]["max_tokens"]
 
-    @property
+    @cached_property
+    def openai_optimize_png(self) -> bool:
+        """Whether PNGs are re-compressed before upload."""
+        return bool(self._settings["openai"].get("optimize_png", False))
+
+    @cached_property
+    def pdf_analyze_dpi(self) -> int:
+        """Get the resolution PDF pages are rendered at for analysis."""
+        return self._settings["pdf"].get("analyze_dpi", 150)
+
+    @cached_property
     def pdf_settings(self) -> dict[str, Any]:
         """Get PDF generation settings."""
         return self._settings["pdf"]
@@ -143,9 +208,13 @@ class Config:
         self._settings["folders"]["input"] = input_folder
         self._settings["folders"]["output"] = output_folder
 
+        # Drop memoized paths so the new folders take effect
+        for name in ("input_folder", "output_folder"):
+            self.__dict__.pop(name, None)
+
         self._config_path.parent.mkdir(parents=True, exist_ok=True)
         with open(self._config_path, "w", encoding="utf-8") as f:
-            yaml.dump(self._settings, f, default_flow_style=False)
+            yaml.dump(self._settings, f, Dumper=_YamlDumper, default_flow_style=False)
 
     def display(self) -> str:
         """Return a formatted string of current configuration (without sensitive data)."""
@@ -156,6 +225,8 @@ Output Folder:    {self.output_folder}
 Archive Folder:   {self.archive_folder}
 Polling Interval: {self.polling_interval}s
 Max Categories:   {self.max_categories}
+Concurrency:      {self.concurrency}
+Use Polling:      {"auto" if self.use_polling is None else self.use_polling}
 OpenAI Model:     {self.openai_model}
 API Key:          {"*" * 8}...{"*" * 4} (configured)
 """
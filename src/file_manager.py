@@ -1,14 +1,17 @@
 """File management operations for Screenshot Wizard."""
 
 import logging
+import os
 import shutil
-from datetime import datetime
 from pathlib import Path
 
-from .config import SUPPORTED_EXTENSIONS
+from .config import SUPPORTED_SUFFIXES
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on "<stem>_<n>" candidates tried before giving up
+_MAX_UNIQUE_ATTEMPTS = 10000
+
 
 class FileManager:
     """Handles file operations for screenshot processing."""
@@ -28,7 +31,11 @@ class FileManager:
         self.output_folder.mkdir(parents=True, exist_ok=True)
 
     def _get_unique_path(self, target_folder: Path, filename: str) -> Path:
-        """Get a unique file path, appending timestamp if file exists.
+        """Reserve a unique file path, appending a counter if the name is taken.
+
+        The returned path is atomically created as an empty placeholder
+        (``O_CREAT | O_EXCL``), so two callers can never be handed the same
+        path. Callers are expected to overwrite it.
 
         Args:
             target_folder: Target directory
@@ -37,18 +44,19 @@ class FileManager:
         Returns:
             Unique path that doesn't conflict with existing files
         """
-        target_path = target_folder / filename
-
-        if not target_path.exists():
-            return target_path
+        stem, suffix = os.path.splitext(filename)
 
-        # File exists, append timestamp
-        stem = target_path.stem
-        suffix = target_path.suffix
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        new_filename = f"{stem}_{timestamp}{suffix}"
+        for n in range(_MAX_UNIQUE_ATTEMPTS):
+            name = filename if n == 0 else f"{stem}_{n}{suffix}"
+            candidate = target_folder / name
+            try:
+                fd = os.open(candidate, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                continue
+            os.close(fd)
+            return candidate
 
-        return target_folder / new_filename
+        raise FileExistsError(f"No free filename for {filename} in {target_folder}")
 
     def get_pdf_output_path(self, source_filename: str) -> Path:
         """Get the output path for a generated PDF.
@@ -57,7 +65,7 @@ class FileManager:
             source_filename: Original PNG filename
 
         Returns:
-            Path for the output PDF
+            Path for the output PDF (created empty as a reservation)
         """
         # Replace .png extension with .pdf
         pdf_filename = Path(source_filename).stem + ".pdf"
@@ -75,7 +83,16 @@ class FileManager:
         archive_path = self._get_unique_path(self.archive_folder, source_path.name)
 
         logger.info(f"Archiving {source_path.name} to {archive_path}")
-        shutil.move(str(source_path), str(archive_path))
+        try:
+            # Atomic rename over the placeholder reserved above
+            os.replace(source_path, archive_path)
+        except OSError:
+            try:
+                # Cross-device archive folder: fall back to copy + delete
+                shutil.move(str(source_path), str(archive_path))
+            except OSError:
+                archive_path.unlink(missing_ok=True)
+                raise
 
         return archive_path
 
@@ -88,11 +105,14 @@ class FileManager:
         Returns:
             List of supported file paths sorted by modification time
         """
-        files = [
-            f for f in input_folder.iterdir()
-            if f.is_file() and f.suffix.lower() in SUPPORTED_EXTENSIONS
-        ]
-        return sorted(files, key=lambda p: p.stat().st_mtime)
+        # One directory pass; DirEntry caches its stat() result for the sort
+        with os.scandir(input_folder) as it:
+            entries = [
+                e for e in it
+                if e.name.lower().endswith(SUPPORTED_SUFFIXES) and e.is_file()
+            ]
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        return [Path(e.path) for e in entries]
 
     def cleanup_empty_input(self, input_folder: Path) -> None:
         """Remove empty subdirectories from input folder.
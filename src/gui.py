@@ -1,22 +1,39 @@
 """Tkinter GUI for Screenshot Wizard."""
 
+import hashlib
 import logging
+import os
 import queue
 import threading
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
-from typing import Literal
+from typing import Callable, Literal
 
 from PIL import Image, ImageTk
 
-from .config import SUPPORTED_EXTENSIONS, Config
+from .config import SUPPORTED_SUFFIXES, Config
 from .main import ProcessingOptions, ScreenshotWizard
-from .pdf_converter import PDFPageConverter
 from .watcher import FolderWatcher
 
 logger = logging.getLogger(__name__)
 
+# Bounding box of the preview thumbnail
+PREVIEW_SIZE = (400, 400)
+
+# Delay before refreshing the file list, so a burst of events costs one scan
+REFRESH_DELAY_MS = 150
+
+# Pause in typing before the input folder entry is applied
+INPUT_CHANGE_DELAY_MS = 500
+
+# Foreground of files picked up by the watcher
+NEW_FILE_COLOR = "blue"
+
+# Pushed onto a queue to stop its consumer thread
+_SENTINEL = object()
+
 
 class ScreenshotWizardGUI:
     """Tkinter GUI for Screenshot Wizard."""
@@ -26,15 +43,43 @@ class ScreenshotWizardGUI:
         self.wizard = ScreenshotWizard(config)
 
         # Queues for thread communication
-        self.watcher_queue: queue.Queue[Path] = queue.Queue()
+        self.watcher_queue: queue.Queue[tuple[Literal["new", "changed"], Path]] = (
+            queue.Queue()
+        )
         self.result_queue: queue.Queue[tuple[str, bool]] = queue.Queue()
 
         # State
         self._watcher: FolderWatcher | None = None
         self._watcher_running = False
+        self._monitor: FolderWatcher | None = None
         self._new_files: set[str] = set()
+        self._listbox_items: list[str] = []
+        self._name_to_index: dict[str, int] = {}
+        self._marked_files: set[str] = set()
+        self._refresh_pending = False
+        # Pending after() job that applies an edited input folder
+        self._input_change_job: str | None = None
+        # (folder, mtime_ns) of the last listing; None forces a rescan
+        self._listing_stamp: tuple[Path, int] | None = None
         self._processing = False
+        # Set once the window is closing, so queue consumers stop
+        self._closing = threading.Event()
         self._preview_photo: ImageTk.PhotoImage | None = None
+        # (size, mode) of the image held by _preview_photo
+        self._preview_photo_key: tuple[tuple[int, int], str] | None = None
+        # Thumbnail of the last previewed file, dropped when the file changes
+        self._preview_src: tuple[Path, Image.Image] | None = None
+        # Previews are decoded off the Tk thread, one at a time
+        self._preview_pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="preview"
+        )
+        self._preview_future: Future[Image.Image] | None = None
+        # One long-lived worker runs processing jobs
+        self._process_pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="wizard-proc"
+        )
+        cache_folder = config.cache_folder
+        self._preview_cache_dir = cache_folder / "previews" if cache_folder else None
 
         # Build UI
         self.root = tk.Tk()
@@ -42,14 +87,26 @@ class ScreenshotWizardGUI:
         self.root.geometry("1000x650")
         self.root.minsize(800, 500)
 
+        # Both option frames start packed by _build_main_panels
+        self._thumb_visible = True
+        self._pdf_mode_visible = True
+
         self._build_toolbar()
         self._build_main_panels()
         self._build_status_bar()
 
-        # Start polling queues
-        self._poll_queues()
-        # Start auto-refreshing file list
-        self._auto_refresh_file_list()
+        # Keep the file list in sync with the input folder
+        self._start_monitor()
+        self._refresh_file_list()
+
+        # Forward queue items to the Tk thread as they arrive
+        for source, handler in (
+            (self.watcher_queue, self._handle_watcher_events),
+            (self.result_queue, self._handle_results),
+        ):
+            threading.Thread(
+                target=self._consume_queue, args=(source, handler), daemon=True
+            ).start()
 
     # ── Toolbar ──────────────────────────────────────────────────────
 
@@ -66,6 +123,8 @@ class ScreenshotWizardGUI:
         # Input folder
         ttk.Label(toolbar, text="Input:").pack(side=tk.LEFT)
         self.input_var = tk.StringVar(value=str(self.config.input_folder))
+        self._input_path = self.config.input_folder
+        self.input_var.trace_add("write", self._on_input_var_changed)
         self.input_entry = ttk.Entry(toolbar, textvariable=self.input_var, width=25)
         self.input_entry.pack(side=tk.LEFT, padx=(2, 2))
         ttk.Button(toolbar, text="Browse", command=self._browse_input).pack(
@@ -201,13 +260,14 @@ class ScreenshotWizardGUI:
             self._start_watcher()
 
     def _start_watcher(self) -> None:
-        input_folder = Path(self.input_var.get())
+        input_folder = self._input_path
         input_folder.mkdir(parents=True, exist_ok=True)
 
         self._watcher = FolderWatcher(
             input_folder=input_folder,
             callback=self._on_watcher_detected,
             polling_interval=self.config.polling_interval,
+            use_polling=self.config.use_polling,
         )
         self._watcher.start()
         self._watcher_running = True
@@ -226,10 +286,53 @@ class ScreenshotWizardGUI:
 
     def _on_watcher_detected(self, file_path: Path) -> None:
         """Called from watchdog thread — puts file into queue."""
-        self.watcher_queue.put(file_path)
+        self.watcher_queue.put(("new", file_path))
+
+    def _start_monitor(self) -> None:
+        """Watch the input folder for any change so the file list stays current."""
+        input_folder = self._input_path
+        if not input_folder.is_dir():
+            return
+
+        self._monitor = FolderWatcher(
+            input_folder=input_folder,
+            callback=self._on_folder_changed,
+            polling_interval=self.config.polling_interval,
+            report_all_changes=True,
+            use_polling=self.config.use_polling,
+        )
+        self._monitor.start()
+
+    def _stop_monitor(self) -> None:
+        if self._monitor:
+            self._monitor.stop()
+            self._monitor = None
+
+    def _on_folder_changed(self, file_path: Path) -> None:
+        """Called from watchdog thread — schedules a file list refresh."""
+        self.watcher_queue.put(("changed", file_path))
 
     # ── Folder Browsing ──────────────────────────────────────────────
 
+    def _on_input_var_changed(self, *_args: object) -> None:
+        """Keep the parsed input folder in step with the entry field."""
+        self._input_path = Path(self.input_var.get())
+        # Follow the new folder once typing pauses, not on every keystroke
+        if self._input_change_job is not None:
+            self.root.after_cancel(self._input_change_job)
+        self._input_change_job = self.root.after(
+            INPUT_CHANGE_DELAY_MS, self._apply_input_folder
+        )
+
+    def _apply_input_folder(self) -> None:
+        """Point the folder monitor and file list at the current input folder."""
+        if self._input_change_job is not None:
+            self.root.after_cancel(self._input_change_job)
+            self._input_change_job = None
+        self._stop_monitor()
+        self._start_monitor()
+        self._refresh_file_list()
+
     def _browse_input(self) -> None:
         folder = filedialog.askdirectory(
             title="Select Input Folder",
@@ -242,7 +345,7 @@ class ScreenshotWizardGUI:
             if self._watcher_running:
                 self._stop_watcher()
                 self._start_watcher()
-            self._refresh_file_list()
+            self._apply_input_folder()
 
     def _browse_output(self) -> None:
         folder = filedialog.askdirectory(
@@ -261,94 +364,234 @@ class ScreenshotWizardGUI:
     # ── File List ────────────────────────────────────────────────────
 
     def _refresh_file_list(self) -> None:
-        input_folder = Path(self.input_var.get())
-        if not input_folder.exists():
+        input_folder = self._input_path
+
+        # A directory's mtime changes whenever an entry is added, removed or
+        # renamed, so an unchanged stamp means the listing is still current
+        try:
+            stamp = (input_folder, os.stat(input_folder).st_mtime_ns)
+        except OSError:
+            # Show nothing rather than rows that no longer resolve
+            self._splice_listbox([])
+            self._name_to_index = {}
+            self._marked_files = set()
+            self._listing_stamp = None
+            return
+        if stamp == self._listing_stamp:
             return
 
         # Remember current selection
         current_sel = self._get_selected_filename()
 
-        self.file_listbox.delete(0, tk.END)
-
+        # scandir entries carry their type and stat from the directory read
         try:
-            files = sorted(
-                (
-                    f
-                    for f in input_folder.iterdir()
-                    if f.is_file() and f.suffix.lower() in SUPPORTED_EXTENSIONS
-                ),
-                key=lambda p: p.stat().st_mtime,
-                reverse=True,
-            )
+            with os.scandir(input_folder) as it:
+                entries = [
+                    e
+                    for e in it
+                    if e.name.lower().endswith(SUPPORTED_SUFFIXES)
+                    and e.is_file()
+                ]
+            entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
         except OSError:
             return
 
-        for f in files:
-            prefix = "[NEW] " if f.name in self._new_files else ""
-            self.file_listbox.insert(tk.END, f"{prefix}{f.name}")
-
-        # Restore selection if still present
-        if current_sel:
-            for i in range(self.file_listbox.size()):
-                item = self.file_listbox.get(i)
-                if item.replace("[NEW] ", "") == current_sel:
-                    self.file_listbox.selection_set(i)
-                    break
+        names = [e.name for e in entries]
+        self._splice_listbox(names)
+        self._name_to_index = {name: i for i, name in enumerate(names)}
+        self._mark_new_files()
+        self._listing_stamp = stamp
+
+        # Tk keeps the selection on rows outside the spliced range; only a
+        # selected row that was replaced needs to be found again
+        if current_sel and not self.file_listbox.curselection():
+            i = self._name_to_index.get(current_sel)
+            if i is not None:
+                self.file_listbox.selection_set(i)
+                self.file_listbox.see(i)
+
+    def _mark_new_files(self) -> None:
+        """Colour the rows of watcher-detected files and reset the rest."""
+        index = self._name_to_index
+        for name in self._marked_files - self._new_files:
+            if name in index:
+                self.file_listbox.itemconfig(index[name], foreground="")
+        for name in self._new_files:
+            if name in index:
+                self.file_listbox.itemconfig(index[name], foreground=NEW_FILE_COLOR)
+        self._marked_files = self._new_files & index.keys()
+
+    def _schedule_refresh(self) -> None:
+        """Refresh the file list once, shortly after a burst of changes."""
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        self.root.after(REFRESH_DELAY_MS, self._run_scheduled_refresh)
 
-    def _auto_refresh_file_list(self) -> None:
+    def _run_scheduled_refresh(self) -> None:
+        self._refresh_pending = False
         self._refresh_file_list()
-        self.root.after(2000, self._auto_refresh_file_list)
+
+    def _splice_listbox(self, items: list[str]) -> tuple[int, int]:
+        """Make the listbox show ``items`` by replacing only the rows that differ.
+
+        Args:
+            items: New listbox contents, in display order
+
+        Returns:
+            The ``(start, end)`` range of rows in ``items`` that were inserted
+        """
+        old = self._listbox_items
+        limit = min(len(old), len(items))
+
+        prefix = 0
+        while prefix < limit and old[prefix] == items[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old[-1 - suffix] == items[-1 - suffix]:
+            suffix += 1
+
+        if prefix + suffix < len(old):
+            self.file_listbox.delete(prefix, len(old) - suffix - 1)
+        end = len(items) - suffix
+        if prefix < end:
+            self.file_listbox.insert(prefix, *items[prefix:end])
+
+        self._listbox_items = items
+        return prefix, end
 
     def _get_selected_filename(self) -> str | None:
         sel = self.file_listbox.curselection()
         if not sel:
             return None
-        item = self.file_listbox.get(sel[0])
-        return item.replace("[NEW] ", "")
+        return self.file_listbox.get(sel[0])
 
     def _get_selected_filepath(self) -> Path | None:
         name = self._get_selected_filename()
         if name is None:
             return None
-        return Path(self.input_var.get()) / name
+        return self._input_path / name
 
     # ── Preview ──────────────────────────────────────────────────────
 
     def _on_file_select(self, _event: tk.Event | None = None) -> None:
+        # A file that vanished shows up as a preview error
         file_path = self._get_selected_filepath()
-        if file_path is None or not file_path.exists():
+        if file_path is None:
             return
 
         self._update_options_visibility(file_path)
         self._show_preview(file_path)
 
     def _show_preview(self, file_path: Path) -> None:
+        # Any preview still loading is for a previous selection
+        if self._preview_future is not None:
+            self._preview_future.cancel()
+            self._preview_future = None
+
+        if self._preview_src is not None and self._preview_src[0] == file_path:
+            self._display_preview(self._preview_src[1])
+            return
+
+        future = self._preview_pool.submit(self._load_preview, file_path)
+        self._preview_future = future
+        future.add_done_callback(
+            lambda f: self._on_preview_loaded(file_path, f)
+        )
+
+    def _on_preview_loaded(
+        self, file_path: Path, future: Future[Image.Image]
+    ) -> None:
+        """Called from the preview worker — hands the result to the Tk thread."""
+        if future.cancelled():
+            return
         try:
-            if file_path.suffix.lower() == ".pdf":
-                self._show_pdf_preview(file_path)
-            else:
-                self._show_image_preview(file_path)
+            self.root.after_idle(self._install_preview, file_path, future)
+        except (RuntimeError, tk.TclError):
+            # Window already destroyed
+            pass
+
+    def _install_preview(
+        self, file_path: Path, future: Future[Image.Image]
+    ) -> None:
+        if future is not self._preview_future:
+            # Superseded by a newer selection
+            return
+        self._preview_future = None
+
+        try:
+            img = future.result()
         except Exception as e:
             self.preview_label.config(image="", text=f"Preview error: {e}")
             self._preview_photo = None
+            self._preview_photo_key = None
+            return
+
+        self._preview_src = (file_path, img)
+        self._display_preview(img)
 
-    def _show_image_preview(self, file_path: Path) -> None:
-        img = Image.open(file_path)
-        # Fit to preview area
-        max_w, max_h = 400, 400
-        img.thumbnail((max_w, max_h), Image.Resampling.LANCZOS)
-        self._preview_photo = ImageTk.PhotoImage(img)
+    def _display_preview(self, img: Image.Image) -> None:
+        key = (img.size, img.mode)
+        if self._preview_photo is not None and key == self._preview_photo_key:
+            # Thumbnails of same-sized screenshots reuse the Tk image rather
+            # than allocating a new one per selection
+            self._preview_photo.paste(img)
+        else:
+            self._preview_photo = ImageTk.PhotoImage(img)
+            self._preview_photo_key = key
         self.preview_label.config(image=self._preview_photo, text="")
 
-    def _show_pdf_preview(self, file_path: Path) -> None:
+    def _load_preview(self, file_path: Path) -> Image.Image:
+        """Return the preview thumbnail for a file, from disk cache if possible."""
+        cache_path = self._preview_cache_path(file_path)
+        if cache_path is not None and cache_path.exists():
+            img = Image.open(cache_path)
+            img.load()
+            return img
+
+        if file_path.suffix.lower() == ".pdf":
+            img = self._render_pdf_preview(file_path)
+        else:
+            img = Image.open(file_path)
+        # Fit to preview area. thumbnail() already has libjpeg decode JPEGs
+        # at a reduced scale (draft mode), and at this size bilinear is
+        # indistinguishable from Lanczos at a fraction of the cost.
+        img.thumbnail(PREVIEW_SIZE, Image.Resampling.BILINEAR)
+
+        if cache_path is not None:
+            self._store_preview(img, cache_path)
+        return img
+
+    def _render_pdf_preview(self, file_path: Path) -> Image.Image:
         """Render first page of PDF for preview."""
-        import tempfile
+        from .pdf_converter import PDFPageConverter
 
+        # Only rasterize as many pixels as the preview box can show
         converter = PDFPageConverter(dpi=150)
-        with tempfile.TemporaryDirectory() as tmpdir:
-            rendered = Path(tmpdir) / "preview.png"
-            converter.render_page(file_path, 0, rendered)
-            self._show_image_preview(rendered)
+        return converter.render_page_to_pil(file_path, 0, max_size=PREVIEW_SIZE)
+
+    def _preview_cache_path(self, file_path: Path) -> Path | None:
+        """Cache file for a preview, keyed by source path, mtime and size."""
+        if self._preview_cache_dir is None:
+            return None
+        st = file_path.stat()
+        key = hashlib.sha1(str(file_path.resolve()).encode()).hexdigest()
+        return self._preview_cache_dir / f"{key}_{st.st_mtime_ns}_{st.st_size}.png"
+
+    def _store_preview(self, img: Image.Image, cache_path: Path) -> None:
+        """Atomically write a preview thumbnail, replacing stale ones."""
+        key = cache_path.name.split("_", 1)[0]
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            for stale in cache_path.parent.glob(f"{key}_*.png"):
+                stale.unlink(missing_ok=True)
+            if img.mode == "CMYK":
+                img = img.convert("RGB")
+            tmp_path = cache_path.with_suffix(".tmp")
+            img.save(tmp_path, format="PNG")
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to write preview cache {cache_path.name}: {e}")
 
     # ── Options Visibility ───────────────────────────────────────────
 
@@ -356,10 +599,7 @@ class ScreenshotWizardGUI:
         content_type = self.content_type_var.get()
 
         # Show thumbnail options when graphic is selected
-        if content_type == "graphic":
-            self.thumb_frame.pack(fill=tk.X)
-        else:
-            self.thumb_frame.pack_forget()
+        self._set_thumb_visible(content_type == "graphic")
 
         # PDF mode visibility handled by file selection
         file_path = self._get_selected_filepath()
@@ -368,17 +608,31 @@ class ScreenshotWizardGUI:
 
     def _update_options_visibility(self, file_path: Path) -> None:
         """Show/hide PDF mode options based on selected file type."""
-        if file_path.suffix.lower() == ".pdf":
-            self.pdf_mode_frame.pack(fill=tk.X)
-        else:
-            self.pdf_mode_frame.pack_forget()
+        self._set_pdf_mode_visible(file_path.suffix.lower() == ".pdf")
 
         # Thumbnail frame visibility based on content type
         content_type = self.content_type_var.get()
-        if content_type == "graphic":
+        self._set_thumb_visible(content_type == "graphic")
+
+    # Packing re-runs geometry management, so only do it on an actual change
+
+    def _set_thumb_visible(self, visible: bool) -> None:
+        if visible == self._thumb_visible:
+            return
+        if visible:
             self.thumb_frame.pack(fill=tk.X)
         else:
             self.thumb_frame.pack_forget()
+        self._thumb_visible = visible
+
+    def _set_pdf_mode_visible(self, visible: bool) -> None:
+        if visible == self._pdf_mode_visible:
+            return
+        if visible:
+            self.pdf_mode_frame.pack(fill=tk.X)
+        else:
+            self.pdf_mode_frame.pack_forget()
+        self._pdf_mode_visible = visible
 
     # ── Processing ───────────────────────────────────────────────────
 
@@ -403,12 +657,7 @@ class ScreenshotWizardGUI:
             pdf_mode=self.pdf_mode_var.get(),
         )
 
-        thread = threading.Thread(
-            target=self._process_in_thread,
-            args=(file_path, options),
-            daemon=True,
-        )
-        thread.start()
+        self._process_pool.submit(self._process_in_thread, file_path, options)
 
     def _process_in_thread(self, file_path: Path, options: ProcessingOptions) -> None:
         """Run processing in a background thread."""
@@ -419,42 +668,72 @@ class ScreenshotWizardGUI:
             logger.error(f"Processing thread error: {e}")
             self.result_queue.put((file_path.name, False))
 
-    # ── Queue Polling ────────────────────────────────────────────────
-
-    def _poll_queues(self) -> None:
-        # Check watcher queue
-        try:
-            while True:
-                file_path = self.watcher_queue.get_nowait()
+    # ── Queue Consumers ──────────────────────────────────────────────
+
+    def _consume_queue(
+        self, source: queue.Queue, handler: Callable[[list], None]
+    ) -> None:
+        """Block on a queue and hand whatever has arrived to the Tk thread.
+
+        Runs in a background thread. Items that queue up while one batch is
+        being dispatched are delivered together, so a burst of watcher events
+        costs a single refresh.
+        """
+        while True:
+            items = [source.get()]
+            try:
+                while True:
+                    items.append(source.get_nowait())
+            except queue.Empty:
+                pass
+
+            stop = _SENTINEL in items
+            items = [item for item in items if item is not _SENTINEL]
+            if items:
+                try:
+                    self.root.after_idle(handler, items)
+                except (RuntimeError, tk.TclError) as e:
+                    if self._closing.is_set():
+                        # Window already destroyed
+                        return
+                    logger.warning(f"Could not hand queue items to the GUI: {e}")
+            if stop:
+                return
+
+    def _handle_watcher_events(
+        self, events: list[tuple[Literal["new", "changed"], Path]]
+    ) -> None:
+        for kind, file_path in events:
+            if kind == "new":
                 self._new_files.add(file_path.name)
-                self._refresh_file_list()
-        except queue.Empty:
-            pass
-
-        # Check result queue
-        try:
-            while True:
-                filename, success = self.result_queue.get_nowait()
-                self._processing = False
-                self.process_btn.config(state=tk.NORMAL)
-                self._new_files.discard(filename)
-
-                if success:
-                    self._set_status("Ready")
-                    messagebox.showinfo(
-                        "Success", f"Successfully processed: {filename}"
-                    )
-                else:
-                    self._set_status("Ready")
-                    messagebox.showerror(
-                        "Error", f"Failed to process: {filename}"
-                    )
-
-                self._refresh_file_list()
-        except queue.Empty:
-            pass
+            if self._preview_src is not None and self._preview_src[0] == file_path:
+                self._preview_src = None
+            # Adding, removing or renaming a file changes the directory's
+            # mtime, but new-file colours and changes to listed files (which
+            # reorder the list) do not
+            if kind == "new" or file_path.name in self._name_to_index:
+                self._listing_stamp = None
+        self._schedule_refresh()
+
+    def _handle_results(self, results: list[tuple[str, bool]]) -> None:
+        for filename, success in results:
+            self._processing = False
+            self.process_btn.config(state=tk.NORMAL)
+            self._new_files.discard(filename)
+            self._listing_stamp = None
+
+            if success:
+                self._set_status("Ready")
+                messagebox.showinfo(
+                    "Success", f"Successfully processed: {filename}"
+                )
+            else:
+                self._set_status("Ready")
+                messagebox.showerror(
+                    "Error", f"Failed to process: {filename}"
+                )
 
-        self.root.after(250, self._poll_queues)
+            self._refresh_file_list()
 
     # ── Helpers ──────────────────────────────────────────────────────
 
@@ -467,6 +746,12 @@ class ScreenshotWizardGUI:
         self.root.mainloop()
 
     def _on_close(self) -> None:
+        self._closing.set()
         if self._watcher_running:
             self._stop_watcher()
+        self._stop_monitor()
+        self._preview_pool.shutdown(wait=False, cancel_futures=True)
+        self._process_pool.shutdown(wait=False, cancel_futures=True)
+        self.watcher_queue.put(_SENTINEL)
+        self.result_queue.put(_SENTINEL)
         self.root.destroy()
@@ -1,28 +1,30 @@
 """CLI entry point for Screenshot Wizard."""
 
+import atexit
 import logging
+import shutil
 import sys
 import tempfile
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
 from typing import Literal
 
 import click
 
-from .analyzer import ScreenshotAnalyzer
-from .config import SUPPORTED_EXTENSIONS, Config
+from .analyzer import AnalysisResult, BatchScreenshotAnalyzer, ScreenshotAnalyzer
+from .config import PROJECT_ROOT, SUPPORTED_EXTENSIONS, Config
 from .file_manager import FileManager
-from .pdf_converter import PDFPageConverter
-from .pdf_generator import PDFGenerator
 from .watcher import FolderWatcher
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
 logger = logging.getLogger(__name__)
 
 
@@ -46,18 +48,36 @@ class ScreenshotWizard:
         """
         self.config = config
 
+        # PyMuPDF and ReportLab are slow to import and only needed once a
+        # wizard exists, not for commands like `config` or `init`
+        from .pdf_converter import PDFPageConverter
+        from .pdf_generator import PDFGenerator
+
         # Initialize components
         self.analyzer = ScreenshotAnalyzer(
             api_key=config.openai_api_key,
             model=config.openai_model,
             max_tokens=config.openai_max_tokens,
+            cache_dir=config.cache_folder,
+            optimize_png=config.openai_optimize_png,
         )
         self.pdf_generator = PDFGenerator(config.pdf_settings)
         self.file_manager = FileManager(
             archive_folder=config.archive_folder,
             output_folder=config.output_folder,
         )
-        self.pdf_converter = PDFPageConverter()
+        self.pdf_converter = PDFPageConverter(dpi=config.pdf_analyze_dpi)
+
+    @cached_property
+    def _scratch_dir(self) -> Path:
+        """Scratch directory for rendered PDF pages, removed at exit.
+
+        Created on first use and shared by every PDF this wizard processes,
+        rather than creating and deleting a temporary directory per file.
+        """
+        scratch_dir = Path(tempfile.mkdtemp(prefix="screenshot-wizard-"))
+        atexit.register(shutil.rmtree, scratch_dir, ignore_errors=True)
+        return scratch_dir
 
     def process_file(self, file_path: Path, options: ProcessingOptions | None = None) -> bool:
         """Process a single file.
@@ -84,6 +104,35 @@ class ScreenshotWizard:
             logger.error(f"Failed to process {file_path.name}: {e}")
             return False
 
+    def _generate_pdf(
+        self, result: AnalysisResult, source_name: str, options: ProcessingOptions
+    ) -> Path:
+        """Generate the output PDF for an analysis result.
+
+        The output path is reserved by the file manager; if generation fails
+        the empty reservation is removed again.
+
+        Args:
+            result: Analysis result to render
+            source_name: Filename the output PDF name is derived from
+            options: Processing options
+
+        Returns:
+            Path to the generated PDF
+        """
+        pdf_path = self.file_manager.get_pdf_output_path(source_name)
+        try:
+            self.pdf_generator.generate(
+                result,
+                pdf_path,
+                timestamp=datetime.now(),
+                thumbnail_size=options.thumbnail_size,
+            )
+        except Exception:
+            pdf_path.unlink(missing_ok=True)
+            raise
+        return pdf_path
+
     def _process_image(self, file_path: Path, options: ProcessingOptions) -> bool:
         """Process an image file (PNG, JPG, JPEG).
 
@@ -100,13 +149,22 @@ class ScreenshotWizard:
             content_type_override=options.content_type_override,
         )
 
-        pdf_path = self.file_manager.get_pdf_output_path(file_path.name)
-        self.pdf_generator.generate(
-            result,
-            pdf_path,
-            timestamp=datetime.now(),
-            thumbnail_size=options.thumbnail_size,
-        )
+        return self._finalize_image(file_path, result, options)
+
+    def _finalize_image(
+        self, file_path: Path, result: AnalysisResult, options: ProcessingOptions
+    ) -> bool:
+        """Generate the PDF for an analyzed image and archive the source.
+
+        Args:
+            file_path: Path to the image
+            result: Analysis result for the image
+            options: Processing options
+
+        Returns:
+            True if successful
+        """
+        pdf_path = self._generate_pdf(result, file_path.name, options)
 
         self.file_manager.archive_file(file_path)
 
@@ -125,54 +183,204 @@ class ScreenshotWizard:
         """
         if options.pdf_mode == "whole_document":
             # Render first page only for a single analysis
-            with tempfile.TemporaryDirectory() as tmpdir:
-                rendered = Path(tmpdir) / f"{file_path.stem}_page_1.png"
-                self.pdf_converter.render_page(file_path, 0, rendered)
-
-                result = self.analyzer.analyze(
-                    rendered,
-                    max_categories=self.config.max_categories,
-                    content_type_override=options.content_type_override,
-                )
-                result.source_file = file_path.name
-
-                pdf_path = self.file_manager.get_pdf_output_path(file_path.name)
-                self.pdf_generator.generate(
-                    result,
-                    pdf_path,
-                    timestamp=datetime.now(),
-                    thumbnail_size=options.thumbnail_size,
-                )
+            page_image = self.pdf_converter.render_page_bytes(
+                file_path, 0, self._page_image_format(options)
+            )
+            suffix = self._page_suffix(page_image)
+            result = self._analyze_page_image(
+                self._scratch_dir / f"{file_path.stem}_page_1{suffix}", page_image, options
+            )
+            result.source_file = file_path.name
+
+            try:
+                self._generate_pdf(result, file_path.name, options)
+            finally:
+                self._discard_page_image(result)
 
         else:
-            # Per-page mode: render and process each page individually
-            page_count = self.pdf_converter.get_page_count(file_path)
-
-            with tempfile.TemporaryDirectory() as tmpdir:
-                for i in range(page_count):
-                    rendered = Path(tmpdir) / f"{file_path.stem}_page_{i + 1}.png"
-                    self.pdf_converter.render_page(file_path, i, rendered)
-
-                    result = self.analyzer.analyze(
-                        rendered,
-                        max_categories=self.config.max_categories,
-                        content_type_override=options.content_type_override,
-                    )
-                    result.source_file = f"{file_path.name} (page {i + 1})"
-
-                    page_name = f"{file_path.stem}_page_{i + 1}.pdf"
-                    pdf_path = self.file_manager.get_pdf_output_path(page_name)
-                    self.pdf_generator.generate(
-                        result,
-                        pdf_path,
-                        timestamp=datetime.now(),
-                        thumbnail_size=options.thumbnail_size,
-                    )
+            # Per-page mode: pages are independent, so analyze them in parallel.
+            # Rendering stays on this thread with a single open document
+            # (PyMuPDF documents are not thread-safe) and overlaps with the
+            # analysis of pages rendered earlier. At most two pages per
+            # worker are held in memory ahead of the analysis.
+            image_format = self._page_image_format(options)
+            with self.pdf_converter.open(file_path) as pdf:
+                workers = max(1, min(self.config.concurrency, pdf.page_count))
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    pending: set[Future] = set()
+                    try:
+                        for i in range(pdf.page_count):
+                            if len(pending) >= 2 * workers:
+                                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                                for future in done:
+                                    future.result()
+                            pending.add(
+                                pool.submit(
+                                    self._process_pdf_page,
+                                    file_path,
+                                    i,
+                                    pdf.render_page_bytes(i, image_format),
+                                    options,
+                                )
+                            )
+                        for future in as_completed(pending):
+                            future.result()
+                    except Exception:
+                        # Don't start pages that are still queued
+                        for future in pending:
+                            future.cancel()
+                        raise
 
         self.file_manager.archive_file(file_path)
         logger.info(f"Successfully processed PDF: {file_path.name}")
         return True
 
+    @staticmethod
+    def _page_image_format(
+        options: ProcessingOptions,
+    ) -> Literal["png", "jpeg", "auto"]:
+        """Pick the encoding for rendered PDF pages sent to the analyzer.
+
+        Pages forced to graphic mode are sent as JPEG, which is a fraction of
+        the size, and pages forced to text stay PNG so OCR is not affected by
+        compression artifacts. Otherwise the converter decides per page from
+        its content.
+        """
+        if options.content_type_override == "graphic":
+            return "jpeg"
+        if options.content_type_override == "text":
+            return "png"
+        return "auto"
+
+    @staticmethod
+    def _page_suffix(page_image: bytes) -> str:
+        """Return the file suffix matching an encoded page image."""
+        return ".jpg" if page_image.startswith(b"\xff\xd8") else ".png"
+
+    def _analyze_page_image(
+        self, page_path: Path, page_image: bytes, options: ProcessingOptions
+    ) -> AnalysisResult:
+        """Analyze a rendered PDF page held in memory.
+
+        The page image is written to ``page_path`` only when the result
+        embeds it (graphic content), since the PDF generator reads it from
+        disk.
+
+        Args:
+            page_path: Scratch path naming the page image
+            page_image: Encoded image of the page
+            options: Processing options
+
+        Returns:
+            Analysis result for the page
+        """
+        result = self.analyzer.analyze(
+            page_path,
+            max_categories=self.config.max_categories,
+            content_type_override=options.content_type_override,
+            image_bytes=page_image,
+        )
+        if result.source_image_path is not None:
+            result.source_image_path.write_bytes(page_image)
+        return result
+
+    @staticmethod
+    def _discard_page_image(result: AnalysisResult) -> None:
+        """Remove the scratch page image written for a graphic result."""
+        if result.source_image_path is not None:
+            result.source_image_path.unlink(missing_ok=True)
+
+    def _process_pdf_page(
+        self,
+        file_path: Path,
+        page_index: int,
+        page_image: bytes,
+        options: ProcessingOptions,
+    ) -> Path:
+        """Analyze one rendered page of a PDF and generate its output PDF.
+
+        Args:
+            file_path: Path to the source PDF
+            page_index: Zero-based page index
+            page_image: Encoded image of the page
+            options: Processing options
+
+        Returns:
+            Path to the generated PDF
+        """
+        page_number = page_index + 1
+        suffix = self._page_suffix(page_image)
+        result = self._analyze_page_image(
+            self._scratch_dir / f"{file_path.stem}_page_{page_number}{suffix}",
+            page_image,
+            options,
+        )
+        result.source_file = f"{file_path.name} (page {page_number})"
+
+        page_name = f"{file_path.stem}_page_{page_number}.pdf"
+        try:
+            return self._generate_pdf(result, page_name, options)
+        finally:
+            self._discard_page_image(result)
+
+    def process_files_batch_api(
+        self, file_paths: list[Path], options: ProcessingOptions | None = None
+    ) -> int:
+        """Process image files through a single OpenAI Batch API job.
+
+        PDFs are not submitted to the batch and are processed individually.
+
+        Args:
+            file_paths: Files to process
+            options: Processing options (None uses defaults)
+
+        Returns:
+            Number of files processed successfully
+        """
+        if options is None:
+            options = ProcessingOptions()
+
+        success_count = 0
+        images = []
+        for file_path in file_paths:
+            if file_path.suffix.lower() == ".pdf":
+                if self.process_file(file_path, options):
+                    success_count += 1
+            else:
+                images.append(file_path)
+
+        if not images:
+            return success_count
+
+        batch_analyzer = BatchScreenshotAnalyzer(
+            api_key=self.config.openai_api_key,
+            model=self.config.openai_model,
+            max_tokens=self.config.openai_max_tokens,
+        )
+
+        try:
+            results = batch_analyzer.analyze_batch(
+                images,
+                max_categories=self.config.max_categories,
+                content_type_override=options.content_type_override,
+            )
+        except Exception as e:
+            logger.error(f"Batch analysis failed: {e}")
+            return success_count
+
+        for file_path in images:
+            result = results.get(file_path.name)
+            if result is None:
+                logger.error(f"No batch result for {file_path.name}")
+                continue
+            try:
+                if self._finalize_image(file_path, result, options):
+                    success_count += 1
+            except Exception as e:
+                logger.error(f"Failed to process {file_path.name}: {e}")
+
+        return success_count
+
 
 def load_config() -> Config:
     """Load configuration, handling errors gracefully."""
@@ -222,11 +430,13 @@ def watch(process_existing: bool):
         input_folder=config.input_folder,
         callback=wizard.process_file,
         polling_interval=config.polling_interval,
+        max_workers=config.concurrency,
+        use_polling=config.use_polling,
     )
 
     if process_existing:
         click.echo("Processing existing files...")
-        watcher.process_existing()
+        watcher.process_existing(concurrency=config.concurrency)
 
     click.echo("Watching for new files... (Press Ctrl+C to stop)")
     watcher.start()
@@ -293,7 +503,18 @@ def process(
 
 
 @cli.command()
-def batch():
+@click.option(
+    "--batch-api",
+    is_flag=True,
+    help="Submit images as one OpenAI Batch API job (lower cost, up to 24h latency)",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Files processed in parallel (defaults to processing.concurrency)",
+)
+def batch(batch_api: bool, concurrency: int | None):
     """Process all pending files in the input folder."""
     config = load_config()
     config.ensure_folders_exist()
@@ -308,10 +529,23 @@ def batch():
 
     click.echo(f"Found {len(pending_files)} file(s) to process.")
 
-    success_count = 0
-    for file_path in pending_files:
-        if wizard.process_file(file_path):
-            success_count += 1
+    if batch_api:
+        click.echo("Submitting to the OpenAI Batch API, this may take a while...")
+        success_count = wizard.process_files_batch_api(pending_files)
+    else:
+        # Each file is mostly waiting on the API, so threads overlap well
+        success_count = 0
+        if concurrency is None:
+            concurrency = config.concurrency
+        workers = max(1, min(concurrency, len(pending_files)))
+        with ThreadPoolExecutor(max_workers=workers) as pool, click.progressbar(
+            length=len(pending_files), label="Processing"
+        ) as bar:
+            futures = [pool.submit(wizard.process_file, f) for f in pending_files]
+            for future in as_completed(futures):
+                if future.result():
+                    success_count += 1
+                bar.update(1)
 
     click.echo(f"Processed {success_count}/{len(pending_files)} files successfully.")
 
@@ -333,7 +567,7 @@ def show_config():
 @cli.command()
 def init():
     """Initialize default configuration and folder structure."""
-    project_root = Path(__file__).parent.parent
+    project_root = PROJECT_ROOT
 
     # Create folders
     folders = ["input", "output", "archive"]
@@ -377,6 +611,12 @@ def gui():
 
 def main():
     """Main entry point."""
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
     cli()
 
 
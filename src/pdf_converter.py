@@ -2,11 +2,120 @@
 
 import logging
 from pathlib import Path
+from typing import Literal
 
 import pymupdf
+from PIL import Image
 
 logger = logging.getLogger(__name__)
 
+JPEG_QUALITY = 85
+
+# Grayscale histogram entropy (bits) above which a page is treated as
+# photographic. Text and line-art pages are mostly background and score
+# far lower.
+PHOTO_ENTROPY_BITS = 6.0
+
+ImageFormat = Literal["png", "jpeg", "auto"]
+
+
+class OpenPDF:
+    """A PDF kept open so several pages can be rendered from one parse.
+
+    PyMuPDF documents are not thread-safe; use a handle from one thread.
+    """
+
+    def __init__(self, pdf_path: Path, zoom: float):
+        """Open a PDF for rendering.
+
+        Args:
+            pdf_path: Path to the PDF file
+            zoom: Scale factor from PDF points to pixels
+        """
+        self.doc = pymupdf.open(str(pdf_path))
+        self._matrix = pymupdf.Matrix(zoom, zoom)
+
+    def __enter__(self) -> "OpenPDF":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages in the document."""
+        return len(self.doc)
+
+    def render_page(self, page_index: int, output_path: Path) -> Path:
+        """Render a single page to a PNG image.
+
+        Args:
+            page_index: Zero-based page index
+            output_path: Path for the output PNG file
+
+        Returns:
+            Path to the rendered PNG file
+        """
+        pix = _render_pixmap(self.doc, page_index, self._matrix)
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        pix.save(str(output_path))
+        logger.info(f"Rendered page {page_index} to {output_path}")
+
+        return output_path
+
+    def render_page_bytes(
+        self, page_index: int, image_format: ImageFormat = "png"
+    ) -> bytes:
+        """Render a single page to encoded image bytes in memory.
+
+        Args:
+            page_index: Zero-based page index
+            image_format: "png", "jpeg" (quality 85) for smaller output, or
+                "auto" to use JPEG only for photographic pages
+
+        Returns:
+            Encoded page image
+        """
+        pix = _render_pixmap(self.doc, page_index, self._matrix)
+        if image_format == "auto":
+            image_format = _choose_image_format(pix)
+        if image_format == "jpeg":
+            return pix.tobytes("jpeg", jpg_quality=JPEG_QUALITY)
+        return pix.tobytes("png")
+
+    def close(self) -> None:
+        """Close the underlying document."""
+        self.doc.close()
+
+
+def _load_page(doc: pymupdf.Document, page_index: int) -> pymupdf.Page:
+    """Load one page of an open document, rejecting out-of-range indices."""
+    if page_index < 0 or page_index >= len(doc):
+        raise IndexError(
+            f"Page index {page_index} out of range (0-{len(doc) - 1})"
+        )
+
+    return doc.load_page(page_index)
+
+
+def _render_pixmap(
+    doc: pymupdf.Document, page_index: int, matrix: pymupdf.Matrix
+) -> pymupdf.Pixmap:
+    """Rasterize one page of an open document as an RGB pixmap."""
+    return _load_page(doc, page_index).get_pixmap(matrix=matrix, alpha=False)
+
+
+def _choose_image_format(pix: pymupdf.Pixmap) -> Literal["png", "jpeg"]:
+    """Pick JPEG for photographic pages and PNG for text and line art.
+
+    The decision uses the entropy of the page's grayscale histogram, which
+    Pillow computes in C without a per-pixel loop in Python.
+    """
+    gray = pymupdf.Pixmap(pymupdf.csGRAY, pix)
+    entropy = Image.frombytes("L", (gray.width, gray.height), gray.samples).entropy()
+    return "jpeg" if entropy >= PHOTO_ENTROPY_BITS else "png"
+
 
 class PDFPageConverter:
     """Converts PDF pages to PNG images using PyMuPDF."""
@@ -20,6 +129,17 @@ class PDFPageConverter:
         self.dpi = dpi
         self._zoom = dpi / 72.0
 
+    def open(self, pdf_path: Path) -> OpenPDF:
+        """Open a PDF once for rendering several of its pages.
+
+        Args:
+            pdf_path: Path to the PDF file
+
+        Returns:
+            Open document handle; use it as a context manager
+        """
+        return OpenPDF(pdf_path, self._zoom)
+
     def get_page_count(self, pdf_path: Path) -> int:
         """Return the number of pages in a PDF file."""
         with pymupdf.open(str(pdf_path)) as doc:
@@ -36,21 +156,56 @@ class PDFPageConverter:
         Returns:
             Path to the rendered PNG file
         """
-        with pymupdf.open(str(pdf_path)) as doc:
-            if page_index < 0 or page_index >= len(doc):
-                raise IndexError(
-                    f"Page index {page_index} out of range (0-{len(doc) - 1})"
-                )
+        with self.open(pdf_path) as pdf:
+            return pdf.render_page(page_index, output_path)
+
+    def render_page_bytes(
+        self,
+        pdf_path: Path,
+        page_index: int,
+        image_format: ImageFormat = "png",
+    ) -> bytes:
+        """Render a single PDF page to image bytes without writing a file.
 
-            page = doc[page_index]
-            mat = pymupdf.Matrix(self._zoom, self._zoom)
-            pix = page.get_pixmap(matrix=mat)
+        Args:
+            pdf_path: Path to the PDF file
+            page_index: Zero-based page index
+            image_format: "png", "jpeg" (quality 85) for smaller output, or
+                "auto" to use JPEG only for photographic pages
 
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            pix.save(str(output_path))
-            logger.info(f"Rendered page {page_index} to {output_path}")
+        Returns:
+            Encoded page image
+        """
+        with self.open(pdf_path) as pdf:
+            return pdf.render_page_bytes(page_index, image_format)
+
+    def render_page_to_pil(
+        self,
+        pdf_path: Path,
+        page_index: int,
+        dpi: float | None = None,
+        max_size: tuple[int, int] | None = None,
+    ) -> Image.Image:
+        """Render a single PDF page straight to a PIL image, without a file.
 
-        return output_path
+        Args:
+            pdf_path: Path to the PDF file
+            page_index: Zero-based page index
+            dpi: Resolution override (defaults to the converter's dpi)
+            max_size: Optional (width, height) box; the resolution is lowered
+                so the page fits inside it, never raised above ``dpi``
+
+        Returns:
+            RGB image of the page
+        """
+        zoom = self._zoom if dpi is None else dpi / 72.0
+        with pymupdf.open(str(pdf_path)) as doc:
+            page = _load_page(doc, page_index)
+            if max_size is not None:
+                rect = page.rect
+                zoom = min(zoom, max_size[0] / rect.width, max_size[1] / rect.height)
+            pix = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False)
+            return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
 
     def render_all_pages(self, pdf_path: Path, output_dir: Path) -> list[Path]:
         """Render all pages of a PDF to PNG images.
@@ -65,14 +220,10 @@ class PDFPageConverter:
         output_dir.mkdir(parents=True, exist_ok=True)
         rendered = []
 
-        with pymupdf.open(str(pdf_path)) as doc:
-            for i in range(len(doc)):
+        with self.open(pdf_path) as pdf:
+            for i in range(pdf.page_count):
                 output_path = output_dir / f"{pdf_path.stem}_page_{i + 1}.png"
-                page = doc[i]
-                mat = pymupdf.Matrix(self._zoom, self._zoom)
-                pix = page.get_pixmap(matrix=mat)
-                pix.save(str(output_path))
+                pdf.render_page(i, output_path)
                 rendered.append(output_path)
-                logger.info(f"Rendered page {i + 1}/{len(doc)} to {output_path}")
 
         return rendered
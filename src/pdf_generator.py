@@ -1,15 +1,17 @@
 """PDF generation module for Screenshot Wizard."""
 
 import logging
+import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Literal
 
-from PIL import Image as PILImage
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, letter
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1, getSampleStyleSheet
 from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
 from reportlab.platypus import (
     Image as RLImage,
     Paragraph,
@@ -34,6 +36,103 @@ THUMBNAIL_WIDTHS = {
     "full": None,  # Will be calculated based on page width
 }
 
+# Vertical spacing between sections
+SPACE_XS = 0.1 * inch
+SPACE_SM = 0.2 * inch
+SPACE_MD = 0.3 * inch
+SPACE_LG = 0.5 * inch
+
+# Escapes text for ReportLab's paragraph markup in a single pass
+_XML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", "\n": "<br/>"})
+
+# Table styles are identical for every document, so build them once
+_SEPARATOR_STYLE = TableStyle(
+    [
+        ("LINEABOVE", (0, 0), (-1, 0), 1, colors.HexColor("#bdc3c7")),
+    ]
+)
+
+
+@lru_cache(maxsize=4)
+def _header_style(font_family: str) -> TableStyle:
+    """Table style for the category header in the given font family."""
+    return TableStyle(
+        [
+            ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#ecf0f1")),
+            ("TEXTCOLOR", (0, 0), (-1, -1), colors.HexColor("#2c3e50")),
+            ("FONTNAME", (0, 0), (-1, -1), f"{font_family}-Bold"),
+            ("FONTSIZE", (0, 0), (-1, -1), 12),
+            ("PADDING", (0, 0), (-1, -1), 12),
+            ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+            ("BOX", (0, 0), (-1, -1), 1, colors.HexColor("#bdc3c7")),
+        ]
+    )
+
+
+@lru_cache(maxsize=4)
+def _build_styles(font_family: str, font_size: int) -> StyleSheet1:
+    """Build the paragraph styles used in generated PDFs.
+
+    Cached so generators sharing the same font settings share one style
+    sheet. The returned sheet must not be modified.
+
+    Args:
+        font_family: Base font family name
+        font_size: Body text font size
+
+    Returns:
+        Sample style sheet extended with the custom styles
+    """
+    styles = getSampleStyleSheet()
+
+    styles.add(
+        ParagraphStyle(
+            "CategoryHeader",
+            parent=styles["Heading1"],
+            fontName=f"{font_family}-Bold",
+            fontSize=14,
+            textColor=colors.HexColor("#2c3e50"),
+            spaceAfter=12,
+            spaceBefore=0,
+        )
+    )
+
+    styles.add(
+        ParagraphStyle(
+            "CustomBody",
+            parent=styles["Normal"],
+            fontName=font_family,
+            fontSize=font_size,
+            leading=font_size * 1.4,
+            spaceAfter=6,
+        )
+    )
+
+    styles.add(
+        ParagraphStyle(
+            "Footer",
+            parent=styles["Normal"],
+            fontName=font_family,
+            fontSize=9,
+            textColor=colors.HexColor("#7f8c8d"),
+            spaceBefore=12,
+        )
+    )
+
+    styles.add(
+        ParagraphStyle(
+            "DescriptionLabel",
+            parent=styles["Normal"],
+            fontName=f"{font_family}-Bold",
+            fontSize=12,
+            textColor=colors.HexColor("#2c3e50"),
+            spaceAfter=6,
+            spaceBefore=12,
+        )
+    )
+
+    return styles
+
 
 class PDFGenerator:
     """Generates PDF documents from analysis results."""
@@ -49,64 +148,24 @@ class PDFGenerator:
         self.font_size = settings.get("font_size", 11)
         self.margin = settings.get("margin", 72)
 
-        # Create styles
-        self.styles = getSampleStyleSheet()
-        self._create_custom_styles()
-
-    def _create_custom_styles(self) -> None:
-        """Create custom paragraph styles."""
-        self.styles.add(
-            ParagraphStyle(
-                "CategoryHeader",
-                parent=self.styles["Heading1"],
-                fontName=f"{self.font_family}-Bold",
-                fontSize=14,
-                textColor=colors.HexColor("#2c3e50"),
-                spaceAfter=12,
-                spaceBefore=0,
-            )
-        )
-
-        self.styles.add(
-            ParagraphStyle(
-                "CustomBody",
-                parent=self.styles["Normal"],
-                fontName=self.font_family,
-                fontSize=self.font_size,
-                leading=self.font_size * 1.4,
-                spaceAfter=6,
-            )
-        )
+        # Usable area inside the margins; thumbnails leave room for the
+        # header and footer
+        self._content_width = self.page_size[0] - 2 * self.margin
+        self._max_image_height = self.page_size[1] - 2 * self.margin - 2 * inch
 
-        self.styles.add(
-            ParagraphStyle(
-                "Footer",
-                parent=self.styles["Normal"],
-                fontName=self.font_family,
-                fontSize=9,
-                textColor=colors.HexColor("#7f8c8d"),
-                spaceBefore=12,
-            )
-        )
+        self.styles = _build_styles(self.font_family, self.font_size)
 
-        self.styles.add(
-            ParagraphStyle(
-                "DescriptionLabel",
-                parent=self.styles["Normal"],
-                fontName=f"{self.font_family}-Bold",
-                fontSize=12,
-                textColor=colors.HexColor("#2c3e50"),
-                spaceAfter=6,
-                spaceBefore=12,
-            )
-        )
+        # Look the fonts up once here so ReportLab loads and registers them
+        # before the first document is built
+        for font_name in (self.font_family, f"{self.font_family}-Bold"):
+            try:
+                pdfmetrics.getFont(font_name)
+            except KeyError:
+                logger.warning(f"Font not available to ReportLab: {font_name}")
 
     def _escape_text(self, text: str) -> str:
-        """Escape special characters for ReportLab XML."""
-        text = text.replace("&", "&amp;")
-        text = text.replace("<", "&lt;")
-        text = text.replace(">", "&gt;")
-        return text
+        """Escape special characters for ReportLab XML and turn newlines into breaks."""
+        return text.translate(_XML_ESCAPE)
 
     def _create_category_header(self, categories: list[str]) -> Table:
         """Create a formatted category header table."""
@@ -114,20 +173,8 @@ class PDFGenerator:
 
         data = [[f"CATEGORIES: {category_text}"]]
 
-        table = Table(data, colWidths=[self.page_size[0] - 2 * self.margin])
-        table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#ecf0f1")),
-                    ("TEXTCOLOR", (0, 0), (-1, -1), colors.HexColor("#2c3e50")),
-                    ("FONTNAME", (0, 0), (-1, -1), f"{self.font_family}-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, -1), 12),
-                    ("PADDING", (0, 0), (-1, -1), 12),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("BOX", (0, 0), (-1, -1), 1, colors.HexColor("#bdc3c7")),
-                ]
-            )
-        )
+        table = Table(data, colWidths=[self._content_width])
+        table.setStyle(_header_style(self.font_family))
 
         return table
 
@@ -141,14 +188,8 @@ class PDFGenerator:
 
     def _create_separator(self) -> Table:
         """Create a horizontal line separator."""
-        line_table = Table([[""]], colWidths=[self.page_size[0] - 2 * self.margin])
-        line_table.setStyle(
-            TableStyle(
-                [
-                    ("LINEABOVE", (0, 0), (-1, 0), 1, colors.HexColor("#bdc3c7")),
-                ]
-            )
-        )
+        line_table = Table([[""]], colWidths=[self._content_width])
+        line_table.setStyle(_SEPARATOR_STYLE)
         return line_table
 
     def _build_text_section(self, result: AnalysisResult) -> list:
@@ -156,7 +197,6 @@ class PDFGenerator:
         elements = []
 
         text_content = self._escape_text(result.text)
-        text_content = text_content.replace("\n", "<br/>")
 
         body_para = Paragraph(text_content, self.styles["CustomBody"])
         elements.append(body_para)
@@ -176,30 +216,24 @@ class PDFGenerator:
             width = THUMBNAIL_WIDTHS.get(thumbnail_size)
             if width is None:
                 # "full" — use available page width
-                width = self.page_size[0] - 2 * self.margin
+                width = self._content_width
 
             try:
-                # Use Pillow to get actual image dimensions
-                with PILImage.open(result.source_image_path) as pil_img:
-                    img_w, img_h = pil_img.size
-
-                max_height = self.page_size[1] - 2 * self.margin - 2 * inch
-                aspect = img_h / img_w
-                scaled_height = width * aspect
-
-                if scaled_height > max_height:
-                    # Scale down to fit page height
-                    height = max_height
-                    width = max_height / aspect
-                else:
-                    height = scaled_height
-
+                # Fit to the thumbnail width, or shrink further to fit the
+                # page height. ReportLab reads the image size itself, so the
+                # file is opened once and that reader is reused for drawing.
                 img = RLImage(
-                    str(result.source_image_path), width=width, height=height
+                    str(result.source_image_path),
+                    width=width,
+                    height=self._max_image_height,
+                    kind="proportional",
                 )
+                # Lay the image out now so unreadable images are skipped
+                # here rather than failing the whole build
+                img.wrap(width, self._max_image_height)
                 img.hAlign = "CENTER"
                 elements.append(img)
-                elements.append(Spacer(1, 0.2 * inch))
+                elements.append(Spacer(1, SPACE_SM))
             except Exception as e:
                 logger.warning(f"Failed to embed thumbnail: {e}")
 
@@ -209,17 +243,15 @@ class PDFGenerator:
                 Paragraph("Description:", self.styles["DescriptionLabel"])
             )
             desc_text = self._escape_text(result.description)
-            desc_text = desc_text.replace("\n", "<br/>")
             elements.append(Paragraph(desc_text, self.styles["CustomBody"]))
 
         # Also include any extracted text
         if result.text and result.text != "[No text detected]":
-            elements.append(Spacer(1, 0.2 * inch))
+            elements.append(Spacer(1, SPACE_SM))
             elements.append(
                 Paragraph("Extracted Text:", self.styles["DescriptionLabel"])
             )
             text_content = self._escape_text(result.text)
-            text_content = text_content.replace("\n", "<br/>")
             elements.append(Paragraph(text_content, self.styles["CustomBody"]))
 
         return elements
@@ -247,9 +279,13 @@ class PDFGenerator:
 
         logger.info(f"Generating PDF: {output_path.name}")
 
+        # Build into a sibling file and move it into place when complete, so
+        # nothing watching the output folder sees a half-written PDF
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+
         # Create the PDF document
         doc = SimpleDocTemplate(
-            str(output_path),
+            str(tmp_path),
             pagesize=self.page_size,
             leftMargin=self.margin,
             rightMargin=self.margin,
@@ -260,13 +296,18 @@ class PDFGenerator:
         # Build content
         elements = []
 
+        # Flowables only hold the canvas while being drawn, so one separator
+        # can appear twice in a document. They are not shared between
+        # documents, which may be built concurrently.
+        separator = self._create_separator()
+
         # Category header
         elements.append(self._create_category_header(result.categories))
-        elements.append(Spacer(1, 0.3 * inch))
+        elements.append(Spacer(1, SPACE_MD))
 
         # Separator
-        elements.append(self._create_separator())
-        elements.append(Spacer(1, 0.2 * inch))
+        elements.append(separator)
+        elements.append(Spacer(1, SPACE_SM))
 
         # Content section based on type
         if result.content_type == "graphic":
@@ -275,17 +316,22 @@ class PDFGenerator:
             elements.extend(self._build_text_section(result))
 
         # Spacer before footer
-        elements.append(Spacer(1, 0.5 * inch))
+        elements.append(Spacer(1, SPACE_LG))
 
         # Footer line
-        elements.append(self._create_separator())
-        elements.append(Spacer(1, 0.1 * inch))
+        elements.append(separator)
+        elements.append(Spacer(1, SPACE_XS))
 
         # Footer
         elements.append(self._create_footer(result.source_file, timestamp))
 
         # Build the PDF
-        doc.build(elements)
+        try:
+            doc.build(elements)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
 
         logger.info(f"PDF generated successfully: {output_path}")
         return output_path
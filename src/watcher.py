@@ -1,75 +1,410 @@
 """Folder monitoring module for Screenshot Wizard."""
 
+import heapq
 import logging
+import os
+import re
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Callable
 
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
+from watchdog.observers.api import BaseObserver, ObservedWatch
+from watchdog.observers.polling import PollingObserver
 
 from .config import SUPPORTED_EXTENSIONS
 
 logger = logging.getLogger(__name__)
 
+# Number of recently seen files remembered for debouncing
+DEBOUNCE_CACHE_SIZE = 1024
+
+# Supported extensions without the dot, as split off raw event paths
+_SUPPORTED_EXTS = frozenset(ext[1:] for ext in SUPPORTED_EXTENSIONS)
+
+# One observer thread serves every watcher that uses OS notifications. Two
+# watchers on the same folder share one watch, so it is only unscheduled once
+# neither uses it.
+_shared_observer: BaseObserver | None = None
+_shared_watch_users: dict[ObservedWatch, int] = {}
+_shared_lock = threading.Lock()
+
+# Mount table consulted to spot network filesystems (Linux only)
+_MOUNTS_FILE = "/proc/mounts"
+
+# Filesystems whose contents can change without the local kernel seeing the
+# write (other machines, or the host of a VM/container), so no OS
+# notifications arrive for them
+NETWORK_FILESYSTEMS = frozenset(
+    {
+        "nfs", "nfs4", "cifs", "smb3", "smbfs", "afs", "ceph", "glusterfs",
+        "9p", "virtiofs", "fakeowner", "grpcfuse", "fuse.sshfs",
+    }
+)
+
+
+def _is_network_filesystem(path: Path) -> bool:
+    """Check whether ``path`` is on a network or VM-shared mount.
+
+    Reads the Linux mount table; elsewhere this always returns False and
+    polling has to be requested explicitly.
+    """
+    try:
+        with open(_MOUNTS_FILE, encoding="utf-8") as f:
+            mounts = [fields[1:3] for fields in map(str.split, f) if len(fields) >= 3]
+    except OSError:
+        return False
+
+    target = str(path)
+    best_mount, fstype = "", ""
+    for mount_point, fs in mounts:
+        # Spaces and other specials are written as octal escapes
+        mount_point = re.sub(
+            r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), mount_point
+        )
+        inside = target == mount_point or target.startswith(
+            mount_point.rstrip("/") + "/"
+        )
+        if inside and len(mount_point) > len(best_mount):
+            best_mount, fstype = mount_point, fs
+    return fstype in NETWORK_FILESYSTEMS
+
+
+def _is_supported(path: str) -> bool:
+    """Check the extension on the raw event path, before building a Path.
+
+    Most events in a busy folder are for temporary files (``.tmp``,
+    ``.part``, ``.crdownload``), so they are dropped without allocating one.
+    Only the extension is case-folded, not the whole path.
+    """
+    _, dot, ext = path.rpartition(".")
+    if not dot or ext.lower() not in _SUPPORTED_EXTS:
+        return False
+    # Dotfiles such as ``.png`` have no extension; splitext only runs for the
+    # few names that get this far
+    return bool(os.path.splitext(path)[1])
+
+
+class _DelayedDispatcher:
+    """Calls a callback for each scheduled path once it has been quiet.
+
+    Scheduling a path that is already waiting restarts its delay, so a burst
+    of events for one file results in a single callback after the last one
+    (trailing-edge debounce). Callbacks run on a dedicated thread, so the
+    thread scheduling them (the watchdog event thread) never has to sleep
+    while files finish writing.
+    """
+
+    def __init__(self, callback: Callable[[Path], None], delay: float):
+        self.callback = callback
+        self.delay = delay
+        # Heap entries are left in place when a path is rescheduled; only the
+        # one matching the path's current due time in _due is acted on
+        self._heap: list[tuple[float, int, Path]] = []
+        self._due: dict[Path, float] = {}
+        self._counter = 0
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def schedule(self, file_path: Path) -> None:
+        """Call back for ``file_path`` once the delay passes without new events."""
+        with self._cond:
+            self._schedule(file_path)
+
+    def reschedule(self, file_path: Path, delay: float | None = None) -> bool:
+        """Restart the delay for ``file_path`` if it is already waiting.
+
+        Args:
+            file_path: Path to reschedule
+            delay: Delay to wait instead of the usual one
+
+        Returns:
+            True if the path was waiting
+        """
+        with self._cond:
+            if file_path not in self._due:
+                return False
+            self._schedule(file_path, delay)
+            return True
+
+    def cancel(self, file_path: Path) -> None:
+        """Forget ``file_path`` if it is waiting."""
+        with self._cond:
+            self._due.pop(file_path, None)
+
+    def _schedule(self, file_path: Path, delay: float | None = None) -> None:
+        if self._closed:
+            return
+        due = time.monotonic() + (self.delay if delay is None else delay)
+        self._due[file_path] = due
+        # The counter keeps entries with equal due times in FIFO order
+        heapq.heappush(self._heap, (due, self._counter, file_path))
+        self._counter += 1
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="watcher-dispatch", daemon=True
+            )
+            self._thread.start()
+        self._cond.notify()
+
+    def close(self) -> None:
+        """Stop dispatching; paths still waiting are dropped."""
+        with self._cond:
+            self._closed = True
+            self._heap.clear()
+            self._due.clear()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    due, _, file_path = self._heap[0]
+                    if self._due.get(file_path) != due:
+                        # Superseded by a later reschedule
+                        heapq.heappop(self._heap)
+                        continue
+                    remaining = due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+                heapq.heappop(self._heap)
+                del self._due[file_path]
+
+            try:
+                self.callback(file_path)
+            except Exception:
+                logger.exception(f"Error handling {file_path.name}")
+
 
 class FileHandler(FileSystemEventHandler):
     """Handles file system events for supported file types."""
 
-    def __init__(self, callback: Callable[[Path], None], debounce_seconds: float = 1.0):
+    def __init__(
+        self,
+        callback: Callable[[Path], None],
+        debounce_seconds: float = 1.0,
+        settle_seconds: float = 0.05,
+        max_settle_seconds: float = 1.0,
+        executor: Executor | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         """Initialize the handler.
 
         Args:
             callback: Function to call when a supported file is detected
             debounce_seconds: Minimum time between processing the same file
+            settle_seconds: Interval between checks that a file has finished
+                being written; it is handed on once it has gone this long
+                without events and its size is the same at two checks
+            max_settle_seconds: Longest time to wait for a file's size to
+                stop changing before handing it on anyway
+            executor: Runs the callbacks, so several files can be handled at
+                once; None calls back on the handler's dispatch thread
+            clock: Monotonic time source for debouncing, in seconds
         """
         super().__init__()
         self.callback = callback
         self.debounce_seconds = debounce_seconds
-        self._last_processed: dict[str, float] = {}
+        self._clock = clock
+        # Oldest entries are evicted first, so memory stays bounded in
+        # long-running watchers
+        self._last_processed: OrderedDict[str, float] = OrderedDict()
+        self._executor = executor
+        self.max_settle_seconds = max_settle_seconds
+        # Size at the previous check and the time to stop waiting, per file
+        # still being written
+        self._settling: dict[Path, tuple[int, float]] = {}
+        # Files whose writer has closed them, which need no size checks
+        self._written: set[Path] = set()
+        self._dispatcher = _DelayedDispatcher(self._check_settled, settle_seconds)
+
+    def _check_settled(self, file_path: Path) -> None:
+        """Hand a file on once its size stops changing, checking again if not.
+
+        Fast screenshot tools finish writing well before the first check, so
+        most files are handed on after two checks instead of a fixed delay.
+        Where the OS reports the writer closing the file, that is used instead.
+        """
+        if file_path in self._written:
+            self._written.discard(file_path)
+            self._settling.pop(file_path, None)
+            self._dispatch(file_path)
+            return
 
-    def _should_process(self, file_path: Path) -> bool:
-        """Check if a file should be processed (debouncing)."""
-        if file_path.suffix.lower() not in SUPPORTED_EXTENSIONS:
-            return False
+        try:
+            size = file_path.stat().st_size
+        except OSError:
+            # Gone or unreadable; the callback reports it
+            self._settling.pop(file_path, None)
+            self._dispatch(file_path)
+            return
+
+        previous = self._settling.get(file_path)
+        if previous is None:
+            deadline = time.monotonic() + self.max_settle_seconds
+        else:
+            last_size, deadline = previous
+            if size == last_size and size > 0:
+                del self._settling[file_path]
+                self._dispatch(file_path)
+                return
+            if time.monotonic() >= deadline:
+                logger.warning(f"{file_path.name} is still changing; processing anyway")
+                del self._settling[file_path]
+                self._dispatch(file_path)
+                return
+
+        self._settling[file_path] = (size, deadline)
+        self._dispatcher.schedule(file_path)
+
+    def _dispatch(self, file_path: Path) -> None:
+        if self._executor is None:
+            self.callback(file_path)
+            return
+
+        def _log_failure(future: Future) -> None:
+            if not future.cancelled() and future.exception() is not None:
+                logger.error(
+                    f"Error handling {file_path.name}", exc_info=future.exception()
+                )
 
-        current_time = time.time()
-        last_time = self._last_processed.get(str(file_path), 0)
+        self._executor.submit(self.callback, file_path).add_done_callback(_log_failure)
+
+    def _should_process(self, file_path: Path) -> bool:
+        """Check if a supported file should be processed (debouncing)."""
+        key = str(file_path)
+        # Monotonic, so a wall-clock adjustment cannot suppress or repeat files
+        current_time = self._clock()
+        last_time = self._last_processed.get(key)
 
-        if current_time - last_time < self.debounce_seconds:
+        if last_time is not None and current_time - last_time < self.debounce_seconds:
             return False
 
-        self._last_processed[str(file_path)] = current_time
+        self._last_processed[key] = current_time
+        self._last_processed.move_to_end(key)
+        if len(self._last_processed) > DEBOUNCE_CACHE_SIZE:
+            self._last_processed.popitem(last=False)
         return True
 
     def on_created(self, event: FileSystemEvent) -> None:
         """Handle file creation events."""
-        if event.is_directory:
+        if event.is_directory or not _is_supported(event.src_path):
             return
 
         file_path = Path(event.src_path)
+        if self._dispatcher.reschedule(file_path):
+            return
         if self._should_process(file_path):
             logger.info(f"New file detected: {file_path.name}")
-            # Small delay to ensure file is fully written
-            time.sleep(0.5)
-            self.callback(file_path)
+            self._dispatcher.schedule(file_path)
+
+    def on_modified(self, event: FileSystemEvent) -> None:
+        """Handle writes to a file that is still settling."""
+        if not event.is_directory and _is_supported(event.src_path):
+            file_path = Path(event.src_path)
+            # Written to again, so an earlier close no longer means finished
+            self._written.discard(file_path)
+            self._dispatcher.reschedule(file_path)
+
+    def on_closed(self, event: FileSystemEvent) -> None:
+        """Hand a settling file on as soon as its writer closes it.
+
+        Only reported on Linux (inotify's IN_CLOSE_WRITE); elsewhere files
+        are handed on once their size stops changing.
+        """
+        if event.is_directory or not _is_supported(event.src_path):
+            return
+        file_path = Path(event.src_path)
+        self._written.add(file_path)
+        if not self._dispatcher.reschedule(file_path, delay=0):
+            self._written.discard(file_path)
+
+    def on_deleted(self, event: FileSystemEvent) -> None:
+        """Drop a file that disappeared while settling."""
+        if not event.is_directory and _is_supported(event.src_path):
+            self._forget(Path(event.src_path))
 
     def on_moved(self, event: FileSystemEvent) -> None:
         """Handle file move events (e.g., from temp location)."""
         if event.is_directory:
             return
 
+        # A file renamed while settling is only reported under its new name
+        if _is_supported(event.src_path):
+            self._forget(Path(event.src_path))
+        if not _is_supported(event.dest_path):
+            return
         file_path = Path(event.dest_path)
+        if self._dispatcher.reschedule(file_path):
+            return
         if self._should_process(file_path):
             logger.info(f"File moved to folder: {file_path.name}")
-            time.sleep(0.5)
-            self.callback(file_path)
+            self._dispatcher.schedule(file_path)
+
+    def _forget(self, file_path: Path) -> None:
+        """Stop waiting for a file that was deleted or renamed while settling."""
+        self._dispatcher.cancel(file_path)
+        self._settling.pop(file_path, None)
+        self._written.discard(file_path)
+
+    def close(self) -> None:
+        """Stop calling back; files still settling are dropped."""
+        self._dispatcher.close()
 
 
 # Backward-compatible alias
 PNGHandler = FileHandler
 
 
+class ChangeHandler(FileSystemEventHandler):
+    """Reports every change to a supported file, without debouncing.
+
+    Used to keep a view of the folder up to date rather than to trigger
+    processing, so deletions and modifications are reported too.
+    """
+
+    def __init__(self, callback: Callable[[Path], None]):
+        """Initialize the handler.
+
+        Args:
+            callback: Function to call with the path of each changed file
+        """
+        super().__init__()
+        self.callback = callback
+
+    def _report(self, path: str) -> None:
+        if _is_supported(path):
+            self.callback(Path(path))
+
+    def on_created(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            self._report(event.src_path)
+
+    def on_deleted(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            self._report(event.src_path)
+
+    def on_modified(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            self._report(event.src_path)
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            self._report(event.src_path)
+            self._report(event.dest_path)
+
+
 class FolderWatcher:
     """Monitors a folder for new supported files."""
 
@@ -78,6 +413,9 @@ class FolderWatcher:
         input_folder: Path,
         callback: Callable[[Path], None],
         polling_interval: int = 5,
+        report_all_changes: bool = False,
+        max_workers: int = 1,
+        use_polling: bool | None = None,
     ):
         """Initialize the folder watcher.
 
@@ -85,12 +423,45 @@ class FolderWatcher:
             input_folder: Path to monitor for new files
             callback: Function to call when a new file is detected
             polling_interval: Seconds between checks (for fallback polling)
+            report_all_changes: Call back on every create/modify/delete/move
+                of a supported file instead of only on new files
+            max_workers: New files handled at once; the callback must be
+                thread-safe when this is above 1
+            use_polling: Scan the folder every ``polling_interval`` seconds
+                instead of relying on OS notifications, which are not
+                delivered for network shares or Docker bind mounts. Costs a
+                stat() per file per scan. None decides when the watcher
+                starts, polling only if the folder is on a network mount.
         """
-        self.input_folder = input_folder
+        self._set_folder(input_folder)
         self.callback = callback
         self.polling_interval = polling_interval
-        self.observer: Observer | None = None
+        self.report_all_changes = report_all_changes
+        self.max_workers = max_workers
+        self.use_polling = use_polling
+        self._polling = False
+        self.observer: BaseObserver | None = None
+        self._watch: ObservedWatch | None = None
+        self._handler: FileSystemEventHandler | None = None
+        self._pool: ThreadPoolExecutor | None = None
         self._running = False
+        self._stop_event = threading.Event()
+
+    def _set_folder(self, folder: Path) -> None:
+        """Store the folder resolved, along with its string form for watchdog."""
+        self.input_folder = Path(folder).resolve()
+        self._input_folder_str = str(self.input_folder)
+
+    @staticmethod
+    def shared_observer() -> BaseObserver:
+        """Return the running observer shared by watchers, starting it if needed."""
+        global _shared_observer
+        with _shared_lock:
+            if _shared_observer is None or not _shared_observer.is_alive():
+                _shared_observer = Observer()
+                _shared_watch_users.clear()
+                _shared_observer.start()
+            return _shared_observer
 
     def start(self) -> None:
         """Start watching the folder."""
@@ -99,33 +470,103 @@ class FolderWatcher:
 
         logger.info(f"Starting folder watcher on: {self.input_folder}")
 
-        # Set up watchdog observer
-        self.observer = Observer()
-        handler = FileHandler(self.callback)
-
-        self.observer.schedule(handler, str(self.input_folder), recursive=False)
-        self.observer.start()
+        self._polling = self.use_polling
+        if self._polling is None:
+            self._polling = _is_network_filesystem(self.input_folder)
+            if self._polling:
+                logger.info("Input folder is on a network mount; polling for changes.")
+
+        # Polling observers each scan on their own interval; OS notifications
+        # for every watcher come through one shared observer thread
+        if self._polling:
+            self.observer = PollingObserver(timeout=self.polling_interval)
+        else:
+            self.observer = self.shared_observer()
+        if self.report_all_changes:
+            self._handler = ChangeHandler(self.callback)
+        else:
+            if self.max_workers > 1:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="watcher-worker"
+                )
+            self._handler = FileHandler(self.callback, executor=self._pool)
+
+        if self._polling:
+            self._watch = self.observer.schedule(
+                self._handler, self._input_folder_str, recursive=False
+            )
+            self.observer.start()
+        else:
+            with _shared_lock:
+                self._watch = self.observer.schedule(
+                    self._handler, self._input_folder_str, recursive=False
+                )
+                _shared_watch_users[self._watch] = (
+                    _shared_watch_users.get(self._watch, 0) + 1
+                )
         self._running = True
+        self._stop_event.clear()
 
         logger.info("Folder watcher started. Press Ctrl+C to stop.")
 
     def run_forever(self) -> None:
-        """Run the watcher until interrupted."""
+        """Run the watcher until interrupted or stopped."""
+        # An untimed wait cannot be interrupted by Ctrl+C on Windows, so wake
+        # up there every polling interval; elsewhere sleep until stop()
+        timeout = self.polling_interval if os.name == "nt" else None
         try:
-            while self._running:
-                time.sleep(self.polling_interval)
+            while self._running and not self._stop_event.wait(timeout):
+                pass
         except KeyboardInterrupt:
             logger.info("Shutdown requested...")
         finally:
             self.stop()
 
-    def stop(self) -> None:
-        """Stop the folder watcher."""
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stop the folder watcher.
+
+        Args:
+            timeout: Longest time to wait for the observer thread to exit,
+                or None to wait indefinitely
+        """
         self._running = False
-        if self.observer:
-            self.observer.stop()
-            self.observer.join()
+        self._stop_event.set()
+        # stop() may be called from run_forever and another thread at once;
+        # only one of them gets the observer to shut down
+        with _shared_lock:
+            observer, self.observer = self.observer, None
+            watch, self._watch = self._watch, None
+        if observer and self._polling:
+            observer.stop()
+            observer.join(timeout)
+            if observer.is_alive():
+                logger.warning("Folder watcher did not stop within the timeout.")
+            else:
+                logger.info("Folder watcher stopped.")
+        elif observer and watch is not None:
+            # Leave the shared observer running for other watchers
+            self._release_watch(observer, watch)
             logger.info("Folder watcher stopped.")
+        if isinstance(self._handler, FileHandler):
+            self._handler.close()
+        if self._pool is not None:
+            # Files already being processed finish; queued ones are dropped
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _release_watch(self, observer: BaseObserver, watch: ObservedWatch) -> None:
+        """Detach this watcher's handler from the shared observer."""
+        with _shared_lock:
+            users = _shared_watch_users.pop(watch, 1) - 1
+            try:
+                if users > 0:
+                    _shared_watch_users[watch] = users
+                    observer.remove_handler_for_watch(self._handler, watch)
+                else:
+                    observer.unschedule(watch)
+            except KeyError:
+                # The observer was stopped and already dropped its watches
+                pass
 
     def set_input_folder(self, new_folder: Path) -> None:
         """Hot-swap the watched directory.
@@ -139,21 +580,28 @@ class FolderWatcher:
         if was_running:
             self.stop()
 
-        self.input_folder = new_folder
+        self._set_folder(new_folder)
 
         if was_running:
             self.start()
 
-    def process_existing(self) -> int:
+    def process_existing(self, concurrency: int = 1) -> int:
         """Process any existing supported files in the input folder.
 
+        Args:
+            concurrency: Number of files handed to the callback at once; the
+                callback must be thread-safe when this is above 1
+
         Returns:
             Number of files processed
         """
-        supported_files = [
-            f for f in self.input_folder.iterdir()
-            if f.is_file() and f.suffix.lower() in SUPPORTED_EXTENSIONS
-        ]
+        # One directory read; the name test runs before the (cached) type check
+        with os.scandir(self._input_folder_str) as it:
+            supported_files = [
+                Path(e.path)
+                for e in it
+                if _is_supported(e.name) and e.is_file()
+            ]
 
         if not supported_files:
             logger.info("No existing supported files found in input folder.")
@@ -161,7 +609,14 @@ class FolderWatcher:
 
         logger.info(f"Found {len(supported_files)} existing file(s) to process.")
 
-        for file_path in supported_files:
-            self.callback(file_path)
+        workers = max(1, min(concurrency, len(supported_files)))
+        if workers == 1:
+            for file_path in supported_files:
+                self.callback(file_path)
+        else:
+            # The callback is mostly waiting on the network, so threads overlap
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for _ in pool.map(self.callback, supported_files):
+                    pass
 
         return len(supported_files)
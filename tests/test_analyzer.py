@@ -6,6 +6,32 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from src.analyzer import (
+    ANALYSIS_PROMPT,
+    AUTO_DETECT_PROMPT,
+    GRAPHIC_ANALYSIS_PROMPT,
+    AnalysisResult,
+    BatchScreenshotAnalyzer,
+    ScreenshotAnalyzer,
+)
+
+# Minimal 1x1 transparent PNG
+_MINIMAL_PNG = (
+    b"\x89PNG\r\n\x1a\n"  # PNG signature
+    b"\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01"  # IHDR chunk
+    b"\x08\x06\x00\x00\x00\x1f\x15\xc4\x89"
+    b"\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xb4"  # IDAT chunk
+    b"\x00\x00\x00\x00IEND\xaeB`\x82"  # IEND chunk
+)
+
+
+@pytest.fixture(scope="session")
+def sample_png(tmp_path_factory):
+    """Create a minimal valid PNG file shared by the whole session."""
+    path = tmp_path_factory.mktemp("pngs") / "sample.png"
+    path.write_bytes(_MINIMAL_PNG)
+    return path
+
 
 class TestScreenshotAnalyzer:
     """Test suite for ScreenshotAnalyzer class."""
@@ -14,34 +40,16 @@ class TestScreenshotAnalyzer:
     def analyzer(self):
         """Create analyzer with mocked OpenAI client."""
         with patch("src.analyzer.OpenAI"):
-            from src.analyzer import ScreenshotAnalyzer
-
             return ScreenshotAnalyzer(api_key="test-key")
 
     @pytest.fixture
-    def sample_png(self):
-        """Create a minimal valid PNG file for testing."""
-        # Minimal 1x1 transparent PNG
-        png_data = bytes(
-            [
-                0x89, 0x50, 0x4E, 0x47, 0x0D, 0x0A, 0x1A, 0x0A,  # PNG signature
-                0x00, 0x00, 0x00, 0x0D, 0x49, 0x48, 0x44, 0x52,  # IHDR chunk
-                0x00, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x01,
-                0x08, 0x06, 0x00, 0x00, 0x00, 0x1F, 0x15, 0xC4,
-                0x89, 0x00, 0x00, 0x00, 0x0A, 0x49, 0x44, 0x41,  # IDAT chunk
-                0x54, 0x78, 0x9C, 0x63, 0x00, 0x01, 0x00, 0x00,
-                0x05, 0x00, 0x01, 0x0D, 0x0A, 0x2D, 0xB4, 0x00,
-                0x00, 0x00, 0x00, 0x49, 0x45, 0x4E, 0x44, 0xAE,  # IEND chunk
-                0x42, 0x60, 0x82,
-            ]
-        )
-
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
-            f.write(png_data)
-            path = Path(f.name)
+    def mocked_analyzer(self):
+        """Create an analyzer and the mock client its API calls go to."""
+        with patch("src.analyzer.OpenAI") as mock_openai:
+            mock_client = MagicMock()
+            mock_openai.return_value = mock_client
 
-        yield path
-        path.unlink(missing_ok=True)
+            yield ScreenshotAnalyzer(api_key="test-key"), mock_client
 
     def test_parse_response_valid_json(self, analyzer):
         """Test parsing valid JSON response."""
@@ -59,6 +67,17 @@ class TestScreenshotAnalyzer:
         assert text == "Hello World"
         assert categories == ["Test"]
 
+    def test_parse_response_json_with_prose_and_unclosed_fence(self, analyzer):
+        """Test that surrounding prose and an unterminated fence are ignored."""
+        content = (
+            'Here is the result {as requested}:\n```json\n'
+            '{"text": "a } b \\" {", "categories": ["Test"]}\n'
+        )
+        text, categories = analyzer._parse_response(content, max_categories=2)
+
+        assert text == 'a } b " {'
+        assert categories == ["Test"]
+
     def test_parse_response_limits_categories(self, analyzer):
         """Test that categories are limited to max_categories."""
         content = '{"text": "Hello", "categories": ["Cat1", "Cat2", "Cat3", "Cat4"]}'
@@ -75,20 +94,140 @@ class TestScreenshotAnalyzer:
         assert text == content
         assert categories == ["Uncategorized"]
 
-    def test_encode_image(self, analyzer, sample_png):
-        """Test image encoding to base64."""
-        encoded = analyzer._encode_image(sample_png)
+    def test_parse_response_without_orjson(self, analyzer):
+        """Test that parsing falls back to the stdlib json module."""
+        content = '{"text": "Fallback", "categories": ["Test"]}'
+        with patch("src.analyzer.orjson", None):
+            text, categories = analyzer._parse_response(content, max_categories=2)
+            _, fallback_categories = analyzer._parse_response("not json", 2)
+
+        assert text == "Fallback"
+        assert categories == ["Test"]
+        assert fallback_categories == ["Uncategorized"]
+
+    def test_build_data_url_round_trips(self, analyzer):
+        """Test that the streamed data URL and hash match the file contents."""
+        import base64
+        import hashlib
+
+        # Larger than one chunk and not a multiple of 3
+        payload = bytes(range(256)) * 1000 + b"xy"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "big.png"
+            path.write_bytes(payload)
+
+            data_url, digest = analyzer._encode_and_hash(path, "image/png")
+
+        header, encoded = data_url.split(",", 1)
+        assert header == "data:image/png;base64"
+        assert base64.b64decode(encoded) == payload
+        assert digest == hashlib.sha256(payload).hexdigest()
+
+    def test_build_data_url_mime_from_extension(self, analyzer):
+        """Test that the data URL header follows the file extension."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            jpg = Path(tmpdir) / "photo.JPG"
+            jpg.write_bytes(b"\xff\xd8data")
+            other = Path(tmpdir) / "image.webp"
+            other.write_bytes(b"data")
+
+            assert analyzer._build_data_url(jpg).startswith("data:image/jpeg;base64,")
+            assert analyzer._build_data_url(other).startswith("data:image/png;base64,")
+
+    def test_oversized_image_is_downscaled(self, analyzer):
+        """Test that images larger than the upload limit are resized."""
+        import base64
+        import io
+
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "wide.png"
+            Image.new("RGB", (4096, 1024), "white").save(path)
+
+            text_url, _ = analyzer._encode_and_hash(path, content_type_override="text")
+            graphic_url, _ = analyzer._encode_and_hash(
+                path, content_type_override="graphic"
+            )
+
+        assert text_url.startswith("data:image/png;base64,")
+        assert graphic_url.startswith("data:image/jpeg;base64,")
+        encoded = text_url.split(",", 1)[1]
+        with Image.open(io.BytesIO(base64.b64decode(encoded))) as img:
+            assert img.size == (2048, 512)
+
+    def test_oversized_jpeg_stays_jpeg(self, analyzer):
+        """Test that a downscaled photo is not re-encoded as a larger PNG."""
+        import base64
+        import io
+
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "photo.jpg"
+            noise = Image.effect_noise((2560, 1920), 40)
+            Image.merge("RGB", (noise, noise.rotate(90), noise)).save(path, quality=85)
+            original = path.read_bytes()
+
+            for content_type in (None, "text", "graphic"):
+                url, _ = analyzer._encode_and_hash(
+                    path, content_type_override=content_type
+                )
+                assert url.startswith("data:image/jpeg;base64,")
+                data = base64.b64decode(url.split(",", 1)[1])
+                assert len(data) < len(original)
+                with Image.open(io.BytesIO(data)) as img:
+                    assert img.size == (2048, 1536)
+
+    def test_oversized_image_sent_as_is_when_reencoding_grows_it(self, analyzer):
+        """Test that the original is uploaded when the resized copy is larger."""
+        import base64
+
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "grainy.jpg"
+            noise = Image.effect_noise((2100, 2100), 60)
+            Image.merge("RGB", (noise, noise, noise)).save(path, quality=10)
+
+            url, _ = analyzer._encode_and_hash(path, content_type_override="text")
+
+            assert url == "data:image/jpeg;base64," + base64.b64encode(
+                path.read_bytes()
+            ).decode()
+
+    def test_optimize_png_recompresses(self):
+        """Test that optimize_png re-encodes PNGs when it saves space."""
+        import base64
+        import io
+
+        from PIL import Image
+
+        with patch("src.analyzer.OpenAI"):
+            analyzer = ScreenshotAnalyzer(api_key="test-key", optimize_png=True)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "flat.png"
+            Image.new("RGB", (400, 400), "white").save(path, compress_level=0)
+
+            data_url, _ = analyzer._encode_and_hash(path)
+            original_size = path.stat().st_size
+
+        encoded = base64.b64decode(data_url.split(",", 1)[1])
+        assert len(encoded) < original_size * 0.9
+        with Image.open(io.BytesIO(encoded)) as img:
+            assert img.size == (400, 400)
 
-        assert isinstance(encoded, str)
-        assert len(encoded) > 0
-        # Base64 should only contain valid characters
+    def test_small_image_sent_unchanged(self, analyzer, sample_png):
+        """Test that images within the limit are uploaded byte-for-byte."""
         import base64
-        try:
-            base64.b64decode(encoded)
-        except Exception:
-            pytest.fail("Invalid base64 encoding")
 
-    def test_analyze_returns_result(self, sample_png):
+        data_url, _ = analyzer._encode_and_hash(sample_png)
+
+        encoded = data_url.split(",", 1)[1]
+        assert base64.b64decode(encoded) == sample_png.read_bytes()
+
+    def test_analyze_returns_result(self, mocked_analyzer, sample_png):
         """Test full analysis flow with mocked API."""
         mock_response = MagicMock()
         mock_response.choices = [MagicMock()]
@@ -96,41 +235,29 @@ class TestScreenshotAnalyzer:
             '{"text": "Test content", "categories": ["Screenshot", "Test"]}'
         )
 
-        with patch("src.analyzer.OpenAI") as mock_openai:
-            mock_client = MagicMock()
-            mock_openai.return_value = mock_client
-            mock_client.chat.completions.create.return_value = mock_response
-
-            from src.analyzer import ScreenshotAnalyzer
-
-            analyzer = ScreenshotAnalyzer(api_key="test-key")
-            result = analyzer.analyze(sample_png, max_categories=2)
+        analyzer, mock_client = mocked_analyzer
+        mock_client.chat.completions.create.return_value = mock_response
+        result = analyzer.analyze(sample_png, max_categories=2)
 
-            assert result.text == "Test content"
-            assert result.categories == ["Screenshot", "Test"]
-            assert result.source_file == sample_png.name
-            assert result.content_type == "text"
+        assert result.text == "Test content"
+        assert result.categories == ["Screenshot", "Test"]
+        assert result.source_file == sample_png.name
+        assert result.content_type == "text"
 
-    def test_analyze_handles_empty_response(self, sample_png):
+    def test_analyze_handles_empty_response(self, mocked_analyzer, sample_png):
         """Test handling of empty API response."""
         mock_response = MagicMock()
         mock_response.choices = [MagicMock()]
         mock_response.choices[0].message.content = ""
 
-        with patch("src.analyzer.OpenAI") as mock_openai:
-            mock_client = MagicMock()
-            mock_openai.return_value = mock_client
-            mock_client.chat.completions.create.return_value = mock_response
-
-            from src.analyzer import ScreenshotAnalyzer
-
-            analyzer = ScreenshotAnalyzer(api_key="test-key")
-            result = analyzer.analyze(sample_png, max_categories=2)
+        analyzer, mock_client = mocked_analyzer
+        mock_client.chat.completions.create.return_value = mock_response
+        result = analyzer.analyze(sample_png, max_categories=2)
 
-            # Should return something reasonable even with empty response
-            assert result.source_file == sample_png.name
+        # Should return something reasonable even with empty response
+        assert result.source_file == sample_png.name
 
-    def test_analyze_graphic_mode(self, sample_png):
+    def test_analyze_graphic_mode(self, mocked_analyzer, sample_png):
         """Test analysis with graphic content type override."""
         mock_response = MagicMock()
         mock_response.choices = [MagicMock()]
@@ -138,24 +265,42 @@ class TestScreenshotAnalyzer:
             '{"description": "A beautiful sunset", "categories": ["Photo", "Nature"]}'
         )
 
-        with patch("src.analyzer.OpenAI") as mock_openai:
-            mock_client = MagicMock()
-            mock_openai.return_value = mock_client
-            mock_client.chat.completions.create.return_value = mock_response
+        analyzer, mock_client = mocked_analyzer
+        mock_client.chat.completions.create.return_value = mock_response
+        result = analyzer.analyze(
+            sample_png, max_categories=2, content_type_override="graphic"
+        )
 
-            from src.analyzer import ScreenshotAnalyzer
+        assert result.content_type == "graphic"
+        assert result.description == "A beautiful sunset"
+        assert result.categories == ["Photo", "Nature"]
+        assert result.source_image_path == sample_png
 
-            analyzer = ScreenshotAnalyzer(api_key="test-key")
-            result = analyzer.analyze(
-                sample_png, max_categories=2, content_type_override="graphic"
-            )
+    def test_analyze_image_bytes(self, mocked_analyzer, sample_png):
+        """Test analyzing in-memory image bytes under a path that doesn't exist."""
+        import base64
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = (
+            '{"description": "A page", "categories": ["Page"]}'
+        )
+        png_data = sample_png.read_bytes()
+        page_path = sample_png.parent / "missing" / "doc_page_1.png"
 
-            assert result.content_type == "graphic"
-            assert result.description == "A beautiful sunset"
-            assert result.categories == ["Photo", "Nature"]
-            assert result.source_image_path == sample_png
+        analyzer, mock_client = mocked_analyzer
+        mock_client.chat.completions.create.return_value = mock_response
+        result = analyzer.analyze(
+            page_path, content_type_override="graphic", image_bytes=png_data
+        )
 
-    def test_analyze_auto_detect(self, sample_png):
+        messages = mock_client.chat.completions.create.call_args.kwargs["messages"]
+        url = messages[0]["content"][1]["image_url"]["url"]
+        assert url == "data:image/png;base64," + base64.b64encode(png_data).decode()
+        assert result.source_file == "doc_page_1.png"
+        assert result.source_image_path == page_path
+
+    def test_analyze_auto_detect(self, mocked_analyzer, sample_png):
         """Test auto-detect content type analysis."""
         mock_response = MagicMock()
         mock_response.choices = [MagicMock()]
@@ -164,18 +309,22 @@ class TestScreenshotAnalyzer:
             '"description": "A chart showing data", "categories": ["Chart"]}'
         )
 
-        with patch("src.analyzer.OpenAI") as mock_openai:
-            mock_client = MagicMock()
-            mock_openai.return_value = mock_client
-            mock_client.chat.completions.create.return_value = mock_response
+        analyzer, mock_client = mocked_analyzer
+        mock_client.chat.completions.create.return_value = mock_response
+        result = analyzer.analyze(sample_png, max_categories=2)
 
-            from src.analyzer import ScreenshotAnalyzer
+        assert result.content_type == "graphic"
+        assert result.description == "A chart showing data"
 
-            analyzer = ScreenshotAnalyzer(api_key="test-key")
-            result = analyzer.analyze(sample_png, max_categories=2)
-
-            assert result.content_type == "graphic"
-            assert result.description == "A chart showing data"
+    def test_build_messages_selects_prompt(self, analyzer, sample_png):
+        """Test that each content type override gets its own prompt."""
+        for override, prompt in [
+            (None, AUTO_DETECT_PROMPT),
+            ("text", ANALYSIS_PROMPT),
+            ("graphic", GRAPHIC_ANALYSIS_PROMPT),
+        ]:
+            messages = analyzer._build_messages(sample_png, override)
+            assert messages[0]["content"][0] == {"type": "text", "text": prompt}
 
     def test_parse_auto_response_valid(self, analyzer):
         """Test parsing auto-detect JSON response."""
@@ -207,10 +356,20 @@ class TestScreenshotAnalyzer:
         assert desc == "A diagram"
         assert cats == ["Diagram"]
 
+    def test_openai_imported_lazily(self):
+        """Test that importing the analyzer does not import openai."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, src.analyzer; "
+            "sys.exit('openai' in sys.modules)"
+        )
+        proc = subprocess.run([sys.executable, "-c", code])
+        assert proc.returncode == 0
+
     def test_analysis_result_backward_compat(self):
         """Test that AnalysisResult works with just the original fields."""
-        from src.analyzer import AnalysisResult
-
         result = AnalysisResult(
             text="Hello",
             categories=["Test"],
@@ -221,7 +380,15 @@ class TestScreenshotAnalyzer:
         assert result.description == ""
         assert result.source_image_path is None
 
-    def test_analyze_uses_correct_mime_type(self, sample_png):
+    def test_analysis_result_uses_slots(self):
+        """Test that AnalysisResult instances carry no per-instance __dict__."""
+        result = AnalysisResult(text="", categories=[], source_file="a.png")
+
+        assert not hasattr(result, "__dict__")
+        result.source_file = "b.png"  # Still mutable
+        assert result.source_file == "b.png"
+
+    def test_analyze_uses_correct_mime_type(self, mocked_analyzer, sample_png):
         """Test that MIME type is determined from file extension."""
         mock_response = MagicMock()
         mock_response.choices = [MagicMock()]
@@ -229,24 +396,303 @@ class TestScreenshotAnalyzer:
             '{"text": "test", "categories": ["Test"]}'
         )
 
+        analyzer, mock_client = mocked_analyzer
+        mock_client.chat.completions.create.return_value = mock_response
+
+        # Test with explicit mime type
+        result = analyzer.analyze(
+            sample_png,
+            max_categories=2,
+            content_type_override="text",
+            image_mime_type="image/jpeg",
+        )
+
+        # Verify the API was called with the correct mime type
+        call_args = mock_client.chat.completions.create.call_args
+        image_url = call_args[1]["messages"][0]["content"][1]["image_url"]["url"]
+        assert image_url.startswith("data:image/jpeg;base64,")
+
+
+class TestBatchScreenshotAnalyzer:
+    """Test suite for BatchScreenshotAnalyzer class."""
+
+    @pytest.fixture
+    def sample_png(self):
+        """Create a minimal PNG file for testing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "shot.png"
+            path.write_bytes(b"\x89PNG\r\n\x1a\nfake")
+            yield path
+
+    def test_write_batch_jsonl(self, sample_png):
+        """Test that one request line is emitted per image."""
+        import io
+        import json
+
+        with patch("src.analyzer.OpenAI"):
+            analyzer = BatchScreenshotAnalyzer(api_key="test-key", model="gpt-4o")
+
+        out = io.BytesIO()
+        analyzer.write_batch_jsonl([sample_png], out)
+        lines = out.getvalue().decode("utf-8").splitlines()
+
+        assert len(lines) == 1
+        request = json.loads(lines[0])
+        assert request["custom_id"] == "shot.png"
+        assert request["url"] == "/v1/chat/completions"
+        assert request["body"]["model"] == "gpt-4o"
+        image_url = request["body"]["messages"][0]["content"][1]["image_url"]["url"]
+        assert image_url.startswith("data:image/png;base64,")
+
+    def test_analyze_batch(self, sample_png):
+        """Test submit, poll and collect against a mocked client."""
+        import json
+
+        output_line = json.dumps(
+            {
+                "custom_id": "shot.png",
+                "response": {
+                    "status_code": 200,
+                    "body": {
+                        "choices": [
+                            {
+                                "message": {
+                                    "content": '{"text": "Batched", "categories": ["Test"]}'
+                                }
+                            }
+                        ]
+                    },
+                },
+            }
+        )
+
         with patch("src.analyzer.OpenAI") as mock_openai:
             mock_client = MagicMock()
             mock_openai.return_value = mock_client
-            mock_client.chat.completions.create.return_value = mock_response
+            mock_client.files.create.return_value.id = "file-in"
+            mock_client.batches.create.return_value.id = "batch-1"
+            completed = MagicMock(status="completed", output_file_id="file-out")
+            mock_client.batches.retrieve.return_value = completed
+            mock_client.files.content.return_value.text = output_line + "\n"
+
+            analyzer = BatchScreenshotAnalyzer(api_key="test-key", poll_interval=0)
+            results = analyzer.analyze_batch(
+                [sample_png], max_categories=2, content_type_override="text"
+            )
 
-            from src.analyzer import ScreenshotAnalyzer
+        assert results["shot.png"].text == "Batched"
+        assert results["shot.png"].categories == ["Test"]
+        mock_client.batches.create.assert_called_once_with(
+            input_file_id="file-in",
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+
+    def test_wait_raises_on_failed_batch(self):
+        """Test that a failed batch surfaces as an error."""
+        with patch("src.analyzer.OpenAI") as mock_openai:
+            mock_client = MagicMock()
+            mock_openai.return_value = mock_client
+            mock_client.batches.retrieve.return_value.status = "failed"
+
+            analyzer = BatchScreenshotAnalyzer(api_key="test-key", poll_interval=0)
+
+            with pytest.raises(RuntimeError, match="failed"):
+                analyzer.wait("batch-1")
+
+
+class TestAsyncAnalysis:
+    """Test suite for concurrent async analysis."""
+
+    @pytest.fixture
+    def sample_pngs(self):
+        """Create a few minimal PNG files for testing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for i in range(3):
+                path = Path(tmpdir) / f"shot{i}.png"
+                path.write_bytes(b"\x89PNG\r\n\x1a\nfake")
+                paths.append(path)
+            yield paths
+
+    def test_analyze_many_limits_concurrency(self, sample_pngs):
+        """Test that results keep input order and concurrency is capped."""
+        import asyncio
+
+        in_flight = 0
+        peak = 0
+
+        async def fake_create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            response = MagicMock()
+            response.choices = [MagicMock()]
+            response.choices[0].message.content = (
+                '{"text": "Async", "categories": ["Test"]}'
+            )
+            return response
+
+        with patch("src.analyzer.OpenAI"), \
+             patch("src.analyzer.AsyncOpenAI") as mock_async_openai:
+            mock_async_openai.return_value.chat.completions.create = fake_create
 
             analyzer = ScreenshotAnalyzer(api_key="test-key")
+            results = asyncio.run(
+                analyzer.analyze_many(
+                    sample_pngs, content_type_override="text", concurrency=2
+                )
+            )
+
+        assert [r.source_file for r in results] == [p.name for p in sample_pngs]
+        assert all(r.text == "Async" for r in results)
+        assert peak <= 2
+
+    def test_analyze_many_returns_exceptions(self, sample_pngs):
+        """Test that a failing request does not cancel the others."""
+        import asyncio
+
+        async def failing_create(**kwargs):
+            raise RuntimeError("boom")
+
+        with patch("src.analyzer.OpenAI"), \
+             patch("src.analyzer.AsyncOpenAI") as mock_async_openai:
+            mock_async_openai.return_value.chat.completions.create = failing_create
+
+            analyzer = ScreenshotAnalyzer(api_key="test-key")
+            results = asyncio.run(analyzer.analyze_many(sample_pngs[:1]))
+
+        assert isinstance(results[0], RuntimeError)
+
+
+    def test_file_io_runs_off_the_event_loop(self, sample_pngs):
+        """Test that hashing and cache reads and writes run in worker threads."""
+        import asyncio
+        import threading
+
+        threads: dict[str, int] = {}
 
-            # Test with explicit mime type
-            result = analyzer.analyze(
-                sample_png,
-                max_categories=2,
-                content_type_override="text",
-                image_mime_type="image/jpeg",
+        async def fake_create(**kwargs):
+            threads["loop"] = threading.get_ident()
+            response = MagicMock()
+            response.choices = [MagicMock()]
+            response.choices[0].message.content = '{"text": "x", "categories": ["T"]}'
+            return response
+
+        with patch("src.analyzer.OpenAI"), \
+             patch("src.analyzer.AsyncOpenAI") as mock_async_openai:
+            mock_async_openai.return_value.chat.completions.create = fake_create
+
+            analyzer = ScreenshotAnalyzer(
+                api_key="test-key", cache_dir=sample_pngs[0].parent / "cache"
+            )
+            for name in ("_encode_and_hash", "_load_cached", "_store_cached"):
+                method = getattr(analyzer, name)
+
+                def record(*args, _name=name, _method=method):
+                    threads[_name] = threading.get_ident()
+                    return _method(*args)
+
+                setattr(analyzer, name, record)
+
+            asyncio.run(analyzer.analyze_async(sample_pngs[0]))
+
+        loop_thread = threads.pop("loop")
+        assert set(threads) == {"_encode_and_hash", "_load_cached", "_store_cached"}
+        assert loop_thread not in threads.values()
+
+
+class TestAnalysisCache:
+    """Test suite for the content-addressed analysis cache."""
+
+    @pytest.fixture
+    def tmp_dir(self):
+        """Create a temporary directory holding an image and a cache folder."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = Path(tmpdir)
+            (base / "shot.png").write_bytes(b"\x89PNG\r\n\x1a\nfake")
+            yield base
+
+    def _mock_response(self, content: str) -> MagicMock:
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = content
+        return response
+
+    def test_cache_hit_skips_api_call(self, tmp_dir):
+        """Test that re-analyzing identical bytes is served from the cache."""
+        with patch("src.analyzer.OpenAI") as mock_openai:
+            mock_client = MagicMock()
+            mock_openai.return_value = mock_client
+            mock_client.chat.completions.create.return_value = self._mock_response(
+                '{"text": "Cached", "categories": ["Test"]}'
             )
 
-            # Verify the API was called with the correct mime type
-            call_args = mock_client.chat.completions.create.call_args
-            image_url = call_args[1]["messages"][0]["content"][1]["image_url"]["url"]
-            assert image_url.startswith("data:image/jpeg;base64,")
+            analyzer = ScreenshotAnalyzer(api_key="test-key", cache_dir=tmp_dir / "cache")
+
+            first = analyzer.analyze(tmp_dir / "shot.png", content_type_override="text")
+
+            # Same content dropped again under a different name
+            copy = tmp_dir / "copy.png"
+            copy.write_bytes((tmp_dir / "shot.png").read_bytes())
+            second = analyzer.analyze(copy, content_type_override="text")
+
+        assert mock_client.chat.completions.create.call_count == 1
+        assert first.text == second.text == "Cached"
+        assert second.source_file == "copy.png"
+
+    def test_cache_keyed_by_prompt(self, tmp_dir):
+        """Test that a different content type override misses the cache."""
+        with patch("src.analyzer.OpenAI") as mock_openai:
+            mock_client = MagicMock()
+            mock_openai.return_value = mock_client
+            mock_client.chat.completions.create.return_value = self._mock_response(
+                '{"text": "x", "description": "y", "categories": ["Test"]}'
+            )
+
+            analyzer = ScreenshotAnalyzer(api_key="test-key", cache_dir=tmp_dir / "cache")
+            analyzer.analyze(tmp_dir / "shot.png", content_type_override="text")
+            analyzer.analyze(tmp_dir / "shot.png", content_type_override="graphic")
+
+        assert mock_client.chat.completions.create.call_count == 2
+
+    def test_concurrent_cache_writes_do_not_collide(self, tmp_dir):
+        """Test that writers of the same entry each use their own temp file."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with patch("src.analyzer.OpenAI"):
+            analyzer = ScreenshotAnalyzer(api_key="test-key", cache_dir=tmp_dir / "cache")
+        cache_path = tmp_dir / "cache" / "entry.json"
+
+        with patch("src.analyzer.logger") as mock_logger:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                for i in range(32):
+                    pool.submit(analyzer._store_cached, cache_path, f"content {i}")
+
+            mock_logger.warning.assert_not_called()
+        assert analyzer._load_cached(cache_path).startswith("content ")
+        assert [p.name for p in cache_path.parent.iterdir()] == ["entry.json"]
+
+        with patch("src.analyzer.os.replace", side_effect=OSError("disk full")):
+            analyzer._store_cached(cache_path, "lost")
+        assert [p.name for p in cache_path.parent.iterdir()] == ["entry.json"]
+
+    def test_request_carries_prompt_cache_key(self, tmp_dir):
+        """Test that the image hash is sent as the prompt cache key."""
+        import hashlib
+
+        with patch("src.analyzer.OpenAI") as mock_openai:
+            mock_client = MagicMock()
+            mock_openai.return_value = mock_client
+            mock_client.chat.completions.create.return_value = self._mock_response(
+                '{"text": "x", "categories": ["Test"]}'
+            )
+
+            analyzer = ScreenshotAnalyzer(api_key="test-key")
+            analyzer.analyze(tmp_dir / "shot.png")
+
+        expected = hashlib.sha256((tmp_dir / "shot.png").read_bytes()).hexdigest()
+        call_args = mock_client.chat.completions.create.call_args
+        assert call_args[1]["extra_body"] == {"prompt_cache_key": expected}
@@ -8,16 +8,47 @@ from unittest.mock import patch
 import pytest
 import yaml
 
+from src.config import Config
+
+# Serialized once at import; yaml.dump is slow enough to matter per test
+_CUSTOM_SETTINGS = {
+    "folders": {
+        "input": "./custom_input",
+        "output": "./custom_output",
+        "archive": "./custom_archive",
+    },
+    "processing": {
+        "polling_interval": 10,
+        "max_categories": 3,
+    },
+    "pdf": {
+        "page_size": "letter",
+        "font_family": "Helvetica",
+        "font_size": 12,
+        "margin": 50,
+    },
+    "openai": {
+        "model": "gpt-4o-mini",
+        "max_tokens": 2048,
+    },
+}
+_CUSTOM_YAML = yaml.dump(_CUSTOM_SETTINGS)
+
+# Folder-only settings; the test fills in its own tmp_path
+_FOLDERS_YAML_TEMPLATE = """\
+folders:
+  input: {root}/test_input
+  output: {root}/test_output
+  archive: {root}/test_archive
+"""
+
 
 class TestConfig:
     """Test suite for Config class."""
 
     def test_default_settings_structure(self):
         """Test that default settings have required keys."""
-        # Import here to avoid loading .env during module import
         with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-            from src.config import Config
-
             config = Config()
             defaults = config._default_settings()
 
@@ -37,24 +68,18 @@ class TestConfig:
             # Remove OPENAI_API_KEY from environment
             os.environ.pop("OPENAI_API_KEY", None)
 
-            from src.config import Config
-
             with pytest.raises(ValueError, match="API key not configured"):
                 Config()
 
     def test_api_key_validation_fails_with_placeholder(self):
         """Test that placeholder API key raises ValueError."""
         with patch.dict(os.environ, {"OPENAI_API_KEY": "your-api-key-here"}):
-            from src.config import Config
-
             with pytest.raises(ValueError, match="API key not configured"):
                 Config()
 
     def test_path_resolution_relative(self):
         """Test relative path resolution."""
         with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-            from src.config import Config
-
             config = Config()
             resolved = config._resolve_path("./input")
 
@@ -64,8 +89,6 @@ class TestConfig:
     def test_path_resolution_absolute(self):
         """Test absolute path stays unchanged."""
         with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-            from src.config import Config
-
             config = Config()
             abs_path = Path(config.project_root / "some" / "absolute" / "path")
             abs_path_str = str(abs_path)
@@ -74,91 +97,69 @@ class TestConfig:
             assert resolved.is_absolute()
             assert str(resolved) == abs_path_str
 
-    def test_custom_yaml_loading(self):
+    def test_custom_yaml_loading(self, tmp_path):
         """Test loading custom YAML configuration."""
-        custom_settings = {
-            "folders": {
-                "input": "./custom_input",
-                "output": "./custom_output",
-                "archive": "./custom_archive",
-            },
-            "processing": {
-                "polling_interval": 10,
-                "max_categories": 3,
-            },
-            "pdf": {
-                "page_size": "letter",
-                "font_family": "Helvetica",
-                "font_size": 12,
-                "margin": 50,
-            },
-            "openai": {
-                "model": "gpt-4o-mini",
-                "max_tokens": 2048,
-            },
-        }
-
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".yaml", delete=False
-        ) as f:
-            yaml.dump(custom_settings, f)
-            temp_path = Path(f.name)
-
-        try:
-            with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-                from src.config import Config
+        temp_path = tmp_path / "config.yaml"
+        temp_path.write_text(_CUSTOM_YAML)
+
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+            config = Config(config_path=temp_path)
+
+            assert config.polling_interval == 10
+            assert config.max_categories == 3
+            assert config.concurrency == 8
+            assert config.use_polling is None
+            assert config.pdf_analyze_dpi == 150
+            assert config.openai_model == "gpt-4o-mini"
+
+    def test_yaml_cache_returns_independent_copies(self):
+        """Test that cached settings are shared but not aliased."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "settings.yaml"
+            config_path.write_text(
+                yaml.dump({"folders": {"input": "./a", "output": "./b", "archive": "./c"}})
+            )
 
-                config = Config(config_path=temp_path)
+            with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+                first = Config(config_path=config_path)
+                with patch("src.config.yaml.load") as mock_load:
+                    second = Config(config_path=config_path)
+                    mock_load.assert_not_called()
 
-                assert config.polling_interval == 10
-                assert config.max_categories == 3
-                assert config.openai_model == "gpt-4o-mini"
-        finally:
-            temp_path.unlink()
+            second._settings["folders"]["input"] = "./changed"
+            assert first._settings["folders"]["input"] == "./a"
 
-    def test_ensure_folders_exist(self):
+    def test_ensure_folders_exist(self, tmp_path):
         """Test that ensure_folders_exist creates directories."""
+        temp_path = tmp_path / "config.yaml"
+        temp_path.write_text(_FOLDERS_YAML_TEMPLATE.format(root=tmp_path.as_posix()))
+
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+            config = Config(config_path=temp_path)
+            config.ensure_folders_exist()
+
+            assert config.input_folder.exists()
+            assert config.output_folder.exists()
+            assert config.archive_folder.exists()
+
+    def test_save_folder_settings_refreshes_cached_paths(self):
+        """Test that memoized folder paths follow saved folder changes."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            custom_settings = {
-                "folders": {
-                    "input": f"{tmpdir}/test_input",
-                    "output": f"{tmpdir}/test_output",
-                    "archive": f"{tmpdir}/test_archive",
-                },
-                "processing": {"polling_interval": 5, "max_categories": 2},
-                "pdf": {
-                    "page_size": "A4",
-                    "font_family": "Helvetica",
-                    "font_size": 11,
-                    "margin": 72,
-                },
-                "openai": {"model": "gpt-4o", "max_tokens": 4096},
-            }
-
-            with tempfile.NamedTemporaryFile(
-                mode="w", suffix=".yaml", delete=False
-            ) as f:
-                yaml.dump(custom_settings, f)
-                temp_path = Path(f.name)
-
-            try:
-                with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-                    from src.config import Config
-
-                    config = Config(config_path=temp_path)
-                    config.ensure_folders_exist()
-
-                    assert config.input_folder.exists()
-                    assert config.output_folder.exists()
-                    assert config.archive_folder.exists()
-            finally:
-                temp_path.unlink()
+            config_path = Path(tmpdir) / "settings.yaml"
+
+            with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+                config = Config(config_path=config_path)
+                assert config.input_folder is config.input_folder
+
+                new_input = Path(tmpdir) / "new_input"
+                config.save_folder_settings(str(new_input), str(Path(tmpdir) / "out"))
+
+                assert config.input_folder == new_input
+                assert config.output_folder == Path(tmpdir) / "out"
 
     def test_display_output(self):
         """Test configuration display string."""
         with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-            from src.config import Config
-
             config = Config()
             display = config.display()
 
@@ -1,55 +1,57 @@
 """Tests for file manager module."""
 
-import tempfile
+import os
 from datetime import datetime
-from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
+from src.file_manager import FileManager
+
 
 class TestFileManager:
     """Test suite for FileManager class."""
 
     @pytest.fixture
-    def temp_dirs(self):
+    def temp_dirs(self, tmp_path):
         """Create temporary directories for testing."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            base = Path(tmpdir)
-            archive = base / "archive"
-            output = base / "output"
-            input_dir = base / "input"
+        base = tmp_path
+        archive = base / "archive"
+        output = base / "output"
+        input_dir = base / "input"
 
-            # Create directories
-            archive.mkdir()
-            output.mkdir()
-            input_dir.mkdir()
+        for folder in (archive, output, input_dir):
+            os.mkdir(folder)
 
-            yield {"base": base, "archive": archive, "output": output, "input": input_dir}
+        return {"base": base, "archive": archive, "output": output, "input": input_dir}
 
     @pytest.fixture
     def file_manager(self, temp_dirs):
         """Create FileManager instance with temp directories."""
-        from src.file_manager import FileManager
-
         return FileManager(
             archive_folder=temp_dirs["archive"],
             output_folder=temp_dirs["output"],
         )
 
-    def test_creates_folders_if_missing(self):
-        """Test that FileManager creates folders if they don't exist."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            base = Path(tmpdir)
-            archive = base / "new_archive"
-            output = base / "new_output"
+    @pytest.fixture
+    def source(self, temp_dirs):
+        """Create a file in the input folder to archive.
+
+        Archiving moves the file away, so each test needs its own copy.
+        """
+        source = temp_dirs["input"] / "test.png"
+        source.write_bytes(b"test content")
+        return source
 
-            from src.file_manager import FileManager
+    def test_creates_folders_if_missing(self, tmp_path):
+        """Test that FileManager creates folders if they don't exist."""
+        archive = tmp_path / "new_archive"
+        output = tmp_path / "new_output"
 
-            fm = FileManager(archive_folder=archive, output_folder=output)
+        fm = FileManager(archive_folder=archive, output_folder=output)
 
-            assert archive.exists()
-            assert output.exists()
+        assert archive.exists()
+        assert output.exists()
 
     def test_get_pdf_output_path(self, file_manager, temp_dirs):
         """Test PDF output path generation."""
@@ -71,28 +73,44 @@ class TestFileManager:
         assert "screenshot_" in pdf_path.name
         assert pdf_path.suffix == ".pdf"
 
-    def test_archive_file(self, file_manager, temp_dirs):
-        """Test archiving a file."""
-        # Create source file
-        source = temp_dirs["input"] / "test.png"
-        source.write_bytes(b"test content")
+    def test_get_pdf_output_path_reserves_names(self, file_manager, temp_dirs):
+        """Test that back-to-back calls never hand out the same path."""
+        paths = [file_manager.get_pdf_output_path("screenshot.png") for _ in range(3)]
 
+        assert [p.name for p in paths] == [
+            "screenshot.pdf",
+            "screenshot_1.pdf",
+            "screenshot_2.pdf",
+        ]
+        assert all(p.exists() for p in paths)
+
+    def test_archive_file(self, file_manager, temp_dirs, source):
+        """Test archiving a file."""
         archived = file_manager.archive_file(source)
 
         assert archived.exists()
         assert archived.parent == temp_dirs["archive"]
         assert not source.exists()
 
-    def test_archive_file_unique(self, file_manager, temp_dirs):
+    def test_archive_file_cross_device_fallback(self, file_manager, source):
+        """Test that archiving falls back to shutil.move across devices."""
+        import errno
+
+        with patch(
+            "src.file_manager.os.replace",
+            side_effect=OSError(errno.EXDEV, "Invalid cross-device link"),
+        ):
+            archived = file_manager.archive_file(source)
+
+        assert archived.read_bytes() == b"test content"
+        assert not source.exists()
+
+    def test_archive_file_unique(self, file_manager, temp_dirs, source):
         """Test archiving with existing file in archive."""
         # Create existing file in archive
         existing = temp_dirs["archive"] / "test.png"
         existing.write_bytes(b"existing")
 
-        # Create source file
-        source = temp_dirs["input"] / "test.png"
-        source.write_bytes(b"new content")
-
         archived = file_manager.archive_file(source)
 
         assert archived.exists()
@@ -104,49 +122,57 @@ class TestFileManager:
         pending = file_manager.list_pending_files(temp_dirs["input"])
         assert pending == []
 
-    def test_list_pending_files(self, file_manager, temp_dirs):
-        """Test listing PNG files."""
-        # Create some test files
-        (temp_dirs["input"] / "test1.png").touch()
-        (temp_dirs["input"] / "test2.PNG").touch()
-        (temp_dirs["input"] / "test3.txt").touch()  # Should be ignored
-
-        pending = file_manager.list_pending_files(temp_dirs["input"])
-
-        assert len(pending) == 2
-        assert all(p.suffix.lower() == ".png" for p in pending)
-
-    def test_list_pending_files_multi_format(self, file_manager, temp_dirs):
-        """Test listing files of all supported formats."""
-        (temp_dirs["input"] / "test1.png").touch()
-        (temp_dirs["input"] / "test2.jpg").touch()
-        (temp_dirs["input"] / "test3.jpeg").touch()
-        (temp_dirs["input"] / "test4.pdf").touch()
-        (temp_dirs["input"] / "test5.txt").touch()  # Should be ignored
-        (temp_dirs["input"] / "test6.bmp").touch()  # Should be ignored
-
-        pending = file_manager.list_pending_files(temp_dirs["input"])
-
-        assert len(pending) == 4
-        extensions = {p.suffix.lower() for p in pending}
-        assert extensions == {".png", ".jpg", ".jpeg", ".pdf"}
-
-    def test_list_pending_files_sorted_by_mtime(self, file_manager, temp_dirs):
-        """Test that files are sorted by modification time."""
+    @pytest.mark.parametrize(
+        ("names", "expected"),
+        [
+            (
+                ["test1.png", "test2.PNG", "test3.txt"],
+                ["test1.png", "test2.PNG"],
+            ),
+            (
+                [
+                    "test1.png",
+                    "test2.jpg",
+                    "test3.jpeg",
+                    "test4.pdf",
+                    "test5.txt",
+                    "test6.bmp",
+                ],
+                ["test1.png", "test2.jpg", "test3.jpeg", "test4.pdf"],
+            ),
+            (
+                ["a.PnG", "b.JpEg", "c.png.txt", "d.pdf/"],
+                ["a.PnG", "b.JpEg"],
+            ),
+            (
+                ["second.png", "first.png"],
+                ["second.png", "first.png"],
+            ),
+        ],
+        ids=["png", "multi_format", "mixed_case", "sorted_mtime"],
+    )
+    def test_list_pending_files(self, file_manager, temp_dirs, names, expected):
+        """Test that supported files are listed oldest first.
+
+        Names ending in "/" are created as directories. Each entry is one
+        second newer than the one before it.
+        """
         import time
 
-        # Create files with different mtimes
-        file1 = temp_dirs["input"] / "first.png"
-        file1.touch()
-        time.sleep(0.1)
-
-        file2 = temp_dirs["input"] / "second.png"
-        file2.touch()
+        now = time.time()
+        for age, name in enumerate(reversed(names)):
+            path = temp_dirs["input"] / name.rstrip("/")
+            if name.endswith("/"):
+                path.mkdir()
+            else:
+                path.touch()
+            # Stamp distinct mtimes rather than sleeping; coarse-grained
+            # filesystems could not tell a short sleep apart anyway
+            os.utime(path, (now - age, now - age))
 
         pending = file_manager.list_pending_files(temp_dirs["input"])
 
-        assert pending[0].name == "first.png"
-        assert pending[1].name == "second.png"
+        assert [p.name for p in pending] == expected
 
     def test_cleanup_empty_input(self, file_manager, temp_dirs):
         """Test cleanup of empty subdirectories."""
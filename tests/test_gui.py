@@ -3,12 +3,24 @@
 import os
 import queue
 import tempfile
+import threading
+import tkinter as tk
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 import yaml
 
+from src.config import SUPPORTED_SUFFIXES, Config, _YamlDumper, _YamlLoader
+from src.gui import (
+    INPUT_CHANGE_DELAY_MS,
+    NEW_FILE_COLOR,
+    PREVIEW_SIZE,
+    REFRESH_DELAY_MS,
+    _SENTINEL,
+    ScreenshotWizardGUI,
+)
+
 
 class TestGUIQueueLogic:
     """Test queue polling and state management logic."""
@@ -16,8 +28,6 @@ class TestGUIQueueLogic:
     def test_watcher_queue_marks_new_files(self):
         """Test that files from watcher queue are marked as NEW."""
         with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-            from src.gui import ScreenshotWizardGUI
-
             # We can't instantiate the full GUI (requires display), so
             # test the underlying data structure logic
             new_files: set[str] = set()
@@ -72,6 +82,32 @@ class TestGUIQueueLogic:
         assert results[0] == ("bad_file.png", False)
 
 
+    def test_consumer_survives_transient_tk_error(self):
+        """Test that a failed hand-off does not stop the queue consumer."""
+        source: queue.Queue = queue.Queue()
+        handled = []
+
+        def after_idle(handler, items):
+            if not handled:
+                handled.append(None)
+                # The next batch arrives while the first hand-off fails
+                source.put(("new", Path("/input/b.png")))
+                source.put(_SENTINEL)
+                raise tk.TclError("busy")
+            handler(items)
+
+        gui = ScreenshotWizardGUI.__new__(ScreenshotWizardGUI)
+        gui.root = MagicMock()
+        gui.root.after_idle.side_effect = after_idle
+        gui._closing = threading.Event()
+        handler = MagicMock()
+
+        source.put(("new", Path("/input/a.png")))
+        gui._consume_queue(source, handler)
+
+        handler.assert_called_once_with([("new", Path("/input/b.png"))])
+
+
 class TestGUIConfigSaving:
     """Test config saving from GUI folder changes."""
 
@@ -96,17 +132,15 @@ class TestGUIConfigSaving:
             }
 
             with open(config_path, "w") as f:
-                yaml.dump(settings, f)
+                yaml.dump(settings, f, Dumper=_YamlDumper)
 
             with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-                from src.config import Config
-
                 config = Config(config_path=config_path)
                 config.save_folder_settings("C:/new/input", "C:/new/output")
 
             # Verify saved
             with open(config_path) as f:
-                saved = yaml.safe_load(f)
+                saved = yaml.load(f, Loader=_YamlLoader)
 
             assert saved["folders"]["input"] == "C:/new/input"
             assert saved["folders"]["output"] == "C:/new/output"
@@ -117,24 +151,30 @@ class TestGUIConfigSaving:
 class TestGUIEntryManagement:
     """Test file list entry logic."""
 
-    def test_new_file_prefix(self):
-        """Test that NEW prefix is added and stripped correctly."""
-        new_files = {"screenshot.png"}
-        filename = "screenshot.png"
+    def test_new_files_are_coloured(self):
+        """Test that NEW files are highlighted and unmarked files reset."""
+        from types import SimpleNamespace
+
+        listbox = MagicMock()
+        gui = SimpleNamespace(
+            file_listbox=listbox,
+            _new_files={"b.png", "gone.png"},
+            _marked_files={"a.png"},
+            _name_to_index={"a.png": 0, "b.png": 1},
+        )
 
-        prefix = "[NEW] " if filename in new_files else ""
-        display = f"{prefix}{filename}"
+        ScreenshotWizardGUI._mark_new_files(gui)
 
-        assert display == "[NEW] screenshot.png"
-        assert display.replace("[NEW] ", "") == "screenshot.png"
+        listbox.itemconfig.assert_any_call(0, foreground="")
+        listbox.itemconfig.assert_any_call(1, foreground=NEW_FILE_COLOR)
+        assert listbox.itemconfig.call_count == 2
+        assert gui._marked_files == {"b.png"}
 
     def test_supported_extensions_filter(self):
         """Test that only supported files appear in list."""
-        from src.config import SUPPORTED_EXTENSIONS
-
         test_files = [
             "test.png",
-            "photo.jpg",
+            "photo.JPG",
             "image.jpeg",
             "doc.pdf",
             "readme.txt",
@@ -142,11 +182,269 @@ class TestGUIEntryManagement:
             "data.csv",
         ]
 
-        filtered = [
-            f for f in test_files if Path(f).suffix.lower() in SUPPORTED_EXTENSIONS
-        ]
+        filtered = [f for f in test_files if f.lower().endswith(SUPPORTED_SUFFIXES)]
 
         assert len(filtered) == 4
+        assert "photo.JPG" in filtered
         assert "readme.txt" not in filtered
         assert "script.py" not in filtered
         assert "data.csv" not in filtered
+
+    def test_splice_listbox_touches_only_changed_rows(self):
+        """Test that the listbox diff deletes and inserts only what changed."""
+        from types import SimpleNamespace
+
+        rows = ["c.png", "b.png", "a.png"]
+        listbox = MagicMock()
+        listbox.delete.side_effect = lambda first, last: rows.__delitem__(
+            slice(first, last + 1)
+        )
+        listbox.insert.side_effect = lambda index, *items: rows.__setitem__(
+            slice(index, index), items
+        )
+        gui = SimpleNamespace(_listbox_items=list(rows), file_listbox=listbox)
+
+        new = ["d.png", "c.png", "a.png"]
+        start, end = ScreenshotWizardGUI._splice_listbox(gui, new)
+
+        assert rows == new
+        assert gui._listbox_items == new
+        assert (start, end) == (0, 2)
+        listbox.delete.assert_called_once_with(0, 1)
+        listbox.insert.assert_called_once_with(0, "d.png", "c.png")
+
+        listbox.reset_mock()
+        ScreenshotWizardGUI._splice_listbox(gui, list(new))
+
+        listbox.delete.assert_not_called()
+        listbox.insert.assert_not_called()
+
+
+class TestGUIPreviewCache:
+    """Test preview thumbnail caching."""
+
+    def test_preview_is_cached_until_file_changes(self):
+        """Test that a cached thumbnail is reused until the source changes."""
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            image_path = Path(tmpdir) / "shot.png"
+            Image.new("RGB", (1200, 900), "red").save(image_path)
+
+            # Bypass __init__, which needs a display
+            gui = ScreenshotWizardGUI.__new__(ScreenshotWizardGUI)
+            gui._preview_cache_dir = Path(tmpdir) / "previews"
+
+            img = gui._load_preview(image_path)
+            cache_path = gui._preview_cache_path(image_path)
+
+            assert max(img.size) == max(PREVIEW_SIZE)
+            assert cache_path.exists()
+
+            with patch("src.gui.Image.open", wraps=Image.open) as mock_open:
+                gui._load_preview(image_path)
+            mock_open.assert_called_once_with(cache_path)
+
+            os.utime(image_path, ns=(0, 0))
+            assert gui._preview_cache_path(image_path) != cache_path
+
+    def test_no_cache_when_disabled(self):
+        """Test that previews are not cached without a cache folder."""
+        from types import SimpleNamespace
+
+        gui = SimpleNamespace(_preview_cache_dir=None)
+
+        assert ScreenshotWizardGUI._preview_cache_path(gui, Path("x.png")) is None
+
+    def test_preview_kept_in_memory_until_changed(self):
+        """Test that reselecting a file reuses the thumbnail in memory."""
+        from concurrent.futures import Future
+
+        from PIL import Image
+
+        class InlineExecutor:
+            def submit(self, fn, *args):
+                future = Future()
+                future.set_result(fn(*args))
+                return future
+
+        gui = ScreenshotWizardGUI.__new__(ScreenshotWizardGUI)
+        gui.root = MagicMock()
+        gui.root.after_idle.side_effect = lambda fn, *args: fn(*args)
+        gui._preview_pool = InlineExecutor()
+        gui._preview_future = None
+        gui._preview_src = None
+        gui._preview_photo = None
+        gui._preview_photo_key = None
+        gui._new_files = set()
+        gui._name_to_index = {}
+        gui._refresh_pending = False
+        gui.preview_label = MagicMock()
+        gui._refresh_file_list = MagicMock()
+        gui._load_preview = MagicMock(return_value=Image.new("RGB", (4, 4)))
+        file_path = Path("/input/shot.png")
+
+        with patch("src.gui.ImageTk") as mock_imagetk:
+            gui._show_preview(file_path)
+            gui._show_preview(file_path)
+            assert gui._load_preview.call_count == 1
+            # The same-sized thumbnail is pasted into the existing Tk image
+            mock_imagetk.PhotoImage.assert_called_once()
+            gui._preview_photo.paste.assert_called_once()
+
+            gui._handle_watcher_events([("changed", file_path)])
+            gui._show_preview(file_path)
+            assert gui._load_preview.call_count == 2
+
+
+class TestGUIRefreshScheduling:
+    """Test coalescing of file list refreshes."""
+
+    def test_burst_of_events_refreshes_once(self):
+        """Test that many watcher events schedule a single refresh."""
+        gui = ScreenshotWizardGUI.__new__(ScreenshotWizardGUI)
+        gui.root = MagicMock()
+        gui._new_files = set()
+        gui._preview_src = None
+        gui._name_to_index = {}
+        gui._listing_stamp = None
+        gui._refresh_pending = False
+        gui._refresh_file_list = MagicMock()
+
+        for i in range(3):
+            gui._handle_watcher_events([("new", Path(f"/input/{i}.png"))])
+
+        gui.root.after.assert_called_once_with(
+            REFRESH_DELAY_MS, gui._run_scheduled_refresh
+        )
+        gui._run_scheduled_refresh()
+
+        gui._refresh_file_list.assert_called_once()
+        assert gui._new_files == {"0.png", "1.png", "2.png"}
+
+    def test_unchanged_folder_is_not_rescanned(self):
+        """Test that refreshing an unchanged folder skips the directory scan."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "a.png").write_bytes(b"png")
+
+            gui = ScreenshotWizardGUI.__new__(ScreenshotWizardGUI)
+            gui._input_path = Path(tmpdir)
+            gui._listing_stamp = None
+            gui._listbox_items = []
+            gui._new_files = set()
+            gui._marked_files = set()
+            gui.file_listbox = MagicMock()
+            gui.file_listbox.curselection.return_value = ()
+
+            with patch("src.gui.os.scandir", wraps=os.scandir) as mock_scandir:
+                gui._refresh_file_list()
+                gui._refresh_file_list()
+                assert mock_scandir.call_count == 1
+
+                gui._listing_stamp = None
+                gui._refresh_file_list()
+                assert mock_scandir.call_count == 2
+
+            assert gui._listbox_items == ["a.png"]
+
+    def test_listing_stamp_kept_for_directory_changes(self):
+        """Test that only events the directory mtime misses force a rescan."""
+        stamp = (Path("/input"), 1)
+        gui = ScreenshotWizardGUI.__new__(ScreenshotWizardGUI)
+        gui.root = MagicMock()
+        gui._new_files = set()
+        gui._preview_src = None
+        gui._name_to_index = {"listed.png": 0}
+        gui._listing_stamp = stamp
+        gui._refresh_pending = True
+
+        gui._handle_watcher_events([("changed", Path("/input/added.png"))])
+        assert gui._listing_stamp == stamp
+
+        gui._handle_watcher_events([("changed", Path("/input/listed.png"))])
+        assert gui._listing_stamp is None
+
+        gui._listing_stamp = stamp
+        gui._handle_watcher_events([("new", Path("/input/added.png"))])
+        assert gui._listing_stamp is None
+
+    def test_typed_input_folder_is_applied_after_pause(self):
+        """Test that editing the input folder re-points the list once typing stops."""
+        with tempfile.TemporaryDirectory() as old, tempfile.TemporaryDirectory() as new:
+            (Path(old) / "old.png").write_bytes(b"png")
+            (Path(new) / "new.png").write_bytes(b"png")
+
+            gui = ScreenshotWizardGUI.__new__(ScreenshotWizardGUI)
+            gui.root = MagicMock()
+            gui.root.after.side_effect = ["job1", "job2", "job3"]
+            gui.input_var = MagicMock()
+            gui._input_path = Path(old)
+            gui._input_change_job = None
+            gui._listing_stamp = None
+            gui._listbox_items = []
+            gui._new_files = set()
+            gui._marked_files = set()
+            gui.file_listbox = MagicMock()
+            gui.file_listbox.curselection.return_value = ()
+            gui._stop_monitor = MagicMock()
+            gui._start_monitor = MagicMock()
+            gui._refresh_file_list()
+
+            for typed in (new[:-1], new):
+                gui.input_var.get.return_value = typed
+                gui._on_input_var_changed()
+
+            gui.root.after_cancel.assert_called_once_with("job1")
+            gui.root.after.assert_called_with(
+                INPUT_CHANGE_DELAY_MS, gui._apply_input_folder
+            )
+            gui._apply_input_folder()
+
+            gui._start_monitor.assert_called_once()
+            assert gui._input_change_job is None
+            assert gui._listbox_items == ["new.png"]
+
+            gui.input_var.get.return_value = new + "-missing"
+            gui._on_input_var_changed()
+            gui._apply_input_folder()
+            assert gui._listbox_items == []
+
+
+class TestGUIWatcherSettings:
+    """Test that folder watchers follow the processing settings."""
+
+    def test_watchers_use_configured_polling(self):
+        """Test that both the watcher and the folder monitor get use_polling."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gui = ScreenshotWizardGUI.__new__(ScreenshotWizardGUI)
+            gui.config = MagicMock(polling_interval=7, use_polling=True)
+            gui._input_path = Path(tmpdir)
+            gui.watcher_btn = MagicMock()
+            gui.status_var = MagicMock()
+
+            with patch("src.gui.FolderWatcher") as mock_watcher:
+                gui._start_watcher()
+                gui._start_monitor()
+
+            assert mock_watcher.call_count == 2
+            for call in mock_watcher.call_args_list:
+                assert call.kwargs["use_polling"] is True
+                assert call.kwargs["polling_interval"] == 7
+
+
+class TestGUIOptionsVisibility:
+    """Test showing and hiding option frames."""
+
+    def test_frames_repacked_only_on_change(self):
+        """Test that an option frame is packed only when its visibility changes."""
+        gui = ScreenshotWizardGUI.__new__(ScreenshotWizardGUI)
+        gui.thumb_frame = MagicMock()
+        gui._thumb_visible = True
+
+        gui._set_thumb_visible(True)
+        gui._set_thumb_visible(False)
+        gui._set_thumb_visible(False)
+
+        gui.thumb_frame.pack.assert_not_called()
+        gui.thumb_frame.pack_forget.assert_called_once()
+        assert gui._thumb_visible is False
@@ -6,6 +6,26 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from src.pdf_converter import PDFPageConverter
+
+
+@pytest.fixture(scope="session")
+def sample_pdf(tmp_path_factory):
+    """Create a minimal two-page PDF once; tests must not modify it."""
+    import pymupdf
+
+    path = tmp_path_factory.mktemp("pdfs") / "sample.pdf"
+
+    doc = pymupdf.open()
+    page = doc.new_page(width=200, height=200)
+    page.insert_text((50, 100), "Test page 1")
+    page2 = doc.new_page(width=200, height=200)
+    page2.insert_text((50, 100), "Test page 2")
+    doc.save(str(path))
+    doc.close()
+
+    return path
+
 
 class TestPDFPageConverter:
     """Test suite for PDFPageConverter class."""
@@ -13,32 +33,8 @@ class TestPDFPageConverter:
     @pytest.fixture
     def converter(self):
         """Create a PDFPageConverter instance."""
-        from src.pdf_converter import PDFPageConverter
-
         return PDFPageConverter(dpi=72)
 
-    @pytest.fixture
-    def sample_pdf(self):
-        """Create a minimal PDF file for testing using pymupdf."""
-        import pymupdf
-
-        # Create temp file path, close it first so pymupdf can write to it
-        fd, tmp_name = tempfile.mkstemp(suffix=".pdf")
-        import os
-        os.close(fd)
-        path = Path(tmp_name)
-
-        doc = pymupdf.open()
-        page = doc.new_page(width=200, height=200)
-        page.insert_text((50, 100), "Test page 1")
-        page2 = doc.new_page(width=200, height=200)
-        page2.insert_text((50, 100), "Test page 2")
-        doc.save(str(path))
-        doc.close()
-
-        yield path
-        path.unlink(missing_ok=True)
-
     def test_get_page_count(self, converter, sample_pdf):
         """Test getting page count from a PDF."""
         count = converter.get_page_count(sample_pdf)
@@ -61,6 +57,68 @@ class TestPDFPageConverter:
             with pytest.raises(IndexError):
                 converter.render_page(sample_pdf, 5, output)
 
+    def test_render_page_bytes(self, converter, sample_pdf):
+        """Test rendering a page to PNG bytes in memory."""
+        data = converter.render_page_bytes(sample_pdf, 1)
+        jpeg = converter.render_page_bytes(sample_pdf, 1, image_format="jpeg")
+
+        assert data.startswith(b"\x89PNG")
+        assert jpeg.startswith(b"\xff\xd8")
+
+    def test_render_page_bytes_auto_format(self, converter, sample_pdf, tmp_path):
+        """Test that auto format keeps text pages PNG and photos JPEG."""
+        import io
+        import shutil
+
+        import pymupdf
+        from PIL import Image
+
+        assert converter.render_page_bytes(sample_pdf, 0, "auto").startswith(
+            b"\x89PNG"
+        )
+
+        # The shared sample is read-only, so add the photo to a copy
+        photo_pdf = tmp_path / "photo.pdf"
+        shutil.copy(sample_pdf, photo_pdf)
+        noise = io.BytesIO()
+        Image.effect_noise((200, 200), 64).save(noise, "PNG")
+        with pymupdf.open(str(photo_pdf)) as doc:
+            doc[1].insert_image(doc[1].rect, stream=noise.getvalue())
+            doc.saveIncr()
+
+        assert converter.render_page_bytes(photo_pdf, 1, "auto").startswith(
+            b"\xff\xd8"
+        )
+
+    def test_render_page_to_pil(self, converter, sample_pdf):
+        """Test rendering a page to an in-memory image."""
+        img = converter.render_page_to_pil(sample_pdf, 0)
+        low = converter.render_page_to_pil(sample_pdf, 0, dpi=36)
+
+        assert img.mode == "RGB"
+        assert img.width > low.width
+
+        fitted = converter.render_page_to_pil(sample_pdf, 0, max_size=(100, 100))
+        assert max(fitted.size) <= 100
+        with pytest.raises(IndexError):
+            converter.render_page_to_pil(sample_pdf, 5)
+
+    def test_open_renders_pages_from_one_handle(self, converter, sample_pdf):
+        """Test rendering several pages through a single open document."""
+        import pymupdf
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch(
+                "src.pdf_converter.pymupdf.open", wraps=pymupdf.open
+            ) as mock_open:
+                with converter.open(sample_pdf) as pdf:
+                    assert pdf.page_count == 2
+                    for i in range(pdf.page_count):
+                        pdf.render_page(i, Path(tmpdir) / f"page_{i}.png")
+
+            mock_open.assert_called_once()
+            assert (Path(tmpdir) / "page_1.png").exists()
+
     def test_render_all_pages(self, converter, sample_pdf):
         """Test rendering all pages."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -73,8 +131,6 @@ class TestPDFPageConverter:
 
     def test_zoom_calculation(self):
         """Test that DPI affects zoom factor."""
-        from src.pdf_converter import PDFPageConverter
-
         converter_low = PDFPageConverter(dpi=72)
         converter_high = PDFPageConverter(dpi=200)
 
@@ -1,11 +1,29 @@
 """Tests for PDF generator module."""
 
-import tempfile
 from datetime import datetime
-from pathlib import Path
 
 import pytest
 
+from src.analyzer import AnalysisResult
+from src.pdf_generator import PDFGenerator
+
+# Minimal valid 1x1 PNG
+_MINIMAL_PNG = (
+    b"\x89PNG\r\n\x1a\n"  # PNG signature
+    b"\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01"  # IHDR chunk
+    b"\x08\x06\x00\x00\x00\x1f\x15\xc4\x89"
+    b"\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xb4"  # IDAT chunk
+    b"\x00\x00\x00\x00IEND\xaeB`\x82"  # IEND chunk
+)
+
+
+@pytest.fixture(scope="session")
+def sample_png(tmp_path_factory):
+    """Create a minimal valid PNG file shared by the whole session."""
+    path = tmp_path_factory.mktemp("pngs") / "sample.png"
+    path.write_bytes(_MINIMAL_PNG)
+    return path
+
 
 class TestPDFGenerator:
     """Test suite for PDFGenerator class."""
@@ -13,8 +31,6 @@ class TestPDFGenerator:
     @pytest.fixture
     def generator(self):
         """Create PDF generator with default settings."""
-        from src.pdf_generator import PDFGenerator
-
         settings = {
             "page_size": "A4",
             "font_family": "Helvetica",
@@ -26,38 +42,12 @@ class TestPDFGenerator:
     @pytest.fixture
     def sample_result(self):
         """Create a sample analysis result."""
-        from src.analyzer import AnalysisResult
-
         return AnalysisResult(
             text="This is sample extracted text.\nWith multiple lines.",
             categories=["Test", "Sample"],
             source_file="test_screenshot.png",
         )
 
-    @pytest.fixture
-    def sample_png(self):
-        """Create a minimal valid PNG file for testing."""
-        png_data = bytes(
-            [
-                0x89, 0x50, 0x4E, 0x47, 0x0D, 0x0A, 0x1A, 0x0A,
-                0x00, 0x00, 0x00, 0x0D, 0x49, 0x48, 0x44, 0x52,
-                0x00, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x01,
-                0x08, 0x06, 0x00, 0x00, 0x00, 0x1F, 0x15, 0xC4,
-                0x89, 0x00, 0x00, 0x00, 0x0A, 0x49, 0x44, 0x41,
-                0x54, 0x78, 0x9C, 0x63, 0x00, 0x01, 0x00, 0x00,
-                0x05, 0x00, 0x01, 0x0D, 0x0A, 0x2D, 0xB4, 0x00,
-                0x00, 0x00, 0x00, 0x49, 0x45, 0x4E, 0x44, 0xAE,
-                0x42, 0x60, 0x82,
-            ]
-        )
-
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
-            f.write(png_data)
-            path = Path(f.name)
-
-        yield path
-        path.unlink(missing_ok=True)
-
     def test_escape_text_ampersand(self, generator):
         """Test escaping ampersand characters."""
         text = "Tom & Jerry"
@@ -78,49 +68,66 @@ class TestPDFGenerator:
         escaped = generator._escape_text(text)
         assert escaped == "A &lt; B &amp; B &gt; C"
 
-    def test_generate_creates_file(self, generator, sample_result):
-        """Test that generate creates a PDF file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = Path(tmpdir) / "test_output.pdf"
-            result_path = generator.generate(sample_result, output_path)
-
-            assert result_path == output_path
-            assert output_path.exists()
-            assert output_path.stat().st_size > 0
+    def test_escape_text_newlines(self, generator):
+        """Test that newlines become line breaks after escaping."""
+        escaped = generator._escape_text("a & b\n<c>")
+        assert escaped == "a &amp; b<br/>&lt;c&gt;"
 
-    def test_generate_with_custom_timestamp(self, generator, sample_result):
+    def test_generate_creates_file(self, generator, sample_result, tmp_path):
+        """Test that generate creates a PDF file."""
+        output_path = tmp_path / "test_output.pdf"
+        result_path = generator.generate(sample_result, output_path)
+
+        assert result_path == output_path
+        assert output_path.exists()
+        assert output_path.stat().st_size > 0
+
+    def test_generate_writes_atomically(self, generator, sample_result, tmp_path):
+        """Test that the PDF only appears at its final path once complete."""
+        from unittest.mock import patch
+
+        output_path = tmp_path / "test_output.pdf"
+        generator.generate(sample_result, output_path)
+        assert [p.name for p in tmp_path.iterdir()] == ["test_output.pdf"]
+
+        failed_path = tmp_path / "failed.pdf"
+        with patch(
+            "src.pdf_generator.SimpleDocTemplate.build",
+            side_effect=RuntimeError("build failed"),
+        ):
+            with pytest.raises(RuntimeError):
+                generator.generate(sample_result, failed_path)
+        assert [p.name for p in tmp_path.iterdir()] == ["test_output.pdf"]
+
+    def test_generate_with_custom_timestamp(self, generator, sample_result, tmp_path):
         """Test generating PDF with custom timestamp."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = Path(tmpdir) / "test_output.pdf"
-            custom_time = datetime(2024, 6, 15, 10, 30, 0)
+        output_path = tmp_path / "test_output.pdf"
+        custom_time = datetime(2024, 6, 15, 10, 30, 0)
 
-            result_path = generator.generate(
-                sample_result, output_path, timestamp=custom_time
-            )
+        result_path = generator.generate(
+            sample_result, output_path, timestamp=custom_time
+        )
 
-            assert result_path.exists()
+        assert result_path.exists()
 
-    def test_generate_with_unicode_text(self, generator):
+    @pytest.mark.slow
+    def test_generate_with_unicode_text(self, generator, tmp_path):
         """Test generating PDF with unicode characters."""
-        from src.analyzer import AnalysisResult
-
         result = AnalysisResult(
             text="Hello 世界! Привет мир! مرحبا",
             categories=["Unicode", "International"],
             source_file="unicode_test.png",
         )
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = Path(tmpdir) / "unicode_output.pdf"
-            result_path = generator.generate(result, output_path)
+        output_path = tmp_path / "unicode_output.pdf"
+        result_path = generator.generate(result, output_path)
 
-            assert result_path.exists()
-            assert output_path.stat().st_size > 0
+        assert result_path.exists()
+        assert output_path.stat().st_size > 0
 
-    def test_generate_with_long_text(self, generator):
+    @pytest.mark.slow
+    def test_generate_with_long_text(self, generator, tmp_path):
         """Test generating PDF with very long text content."""
-        from src.analyzer import AnalysisResult
-
         long_text = "This is a line of text.\n" * 100
 
         result = AnalysisResult(
@@ -129,32 +136,26 @@ class TestPDFGenerator:
             source_file="long_text.png",
         )
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = Path(tmpdir) / "long_output.pdf"
-            result_path = generator.generate(result, output_path)
+        output_path = tmp_path / "long_output.pdf"
+        result_path = generator.generate(result, output_path)
 
-            assert result_path.exists()
+        assert result_path.exists()
 
-    def test_generate_with_single_category(self, generator):
+    def test_generate_with_single_category(self, generator, tmp_path):
         """Test generating PDF with single category."""
-        from src.analyzer import AnalysisResult
-
         result = AnalysisResult(
             text="Simple text",
             categories=["SingleCategory"],
             source_file="single_cat.png",
         )
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = Path(tmpdir) / "single_cat_output.pdf"
-            result_path = generator.generate(result, output_path)
+        output_path = tmp_path / "single_cat_output.pdf"
+        result_path = generator.generate(result, output_path)
 
-            assert result_path.exists()
+        assert result_path.exists()
 
     def test_letter_page_size(self):
         """Test creating generator with letter page size."""
-        from src.pdf_generator import PDFGenerator
-
         settings = {
             "page_size": "letter",
             "font_family": "Helvetica",
@@ -167,10 +168,18 @@ class TestPDFGenerator:
         assert generator.page_size[0] == 612
         assert generator.page_size[1] == 792
 
-    def test_generate_graphic_content(self, generator, sample_png):
-        """Test generating PDF with graphic content type."""
-        from src.analyzer import AnalysisResult
+    def test_styles_shared_between_generators(self, generator):
+        """Test that generators with the same fonts reuse one style sheet."""
+        other = PDFGenerator({"font_family": "Helvetica", "font_size": 11})
+        larger = PDFGenerator({"font_family": "Helvetica", "font_size": 14})
+
+        assert other.styles is generator.styles
+        assert larger.styles is not generator.styles
+        assert larger.styles["CustomBody"].fontSize == 14
 
+    @pytest.mark.slow
+    def test_generate_graphic_content(self, generator, sample_png, tmp_path):
+        """Test generating PDF with graphic content type."""
         result = AnalysisResult(
             text="",
             categories=["Photo", "Nature"],
@@ -180,19 +189,17 @@ class TestPDFGenerator:
             source_image_path=sample_png,
         )
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = Path(tmpdir) / "graphic_output.pdf"
-            result_path = generator.generate(
-                result, output_path, thumbnail_size="medium"
-            )
+        output_path = tmp_path / "graphic_output.pdf"
+        result_path = generator.generate(
+            result, output_path, thumbnail_size="medium"
+        )
 
-            assert result_path.exists()
-            assert output_path.stat().st_size > 0
+        assert result_path.exists()
+        assert output_path.stat().st_size > 0
 
-    def test_generate_graphic_small_thumbnail(self, generator, sample_png):
+    @pytest.mark.slow
+    def test_generate_graphic_small_thumbnail(self, generator, sample_png, tmp_path):
         """Test generating PDF with small thumbnail size."""
-        from src.analyzer import AnalysisResult
-
         result = AnalysisResult(
             text="",
             categories=["Diagram"],
@@ -202,18 +209,16 @@ class TestPDFGenerator:
             source_image_path=sample_png,
         )
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = Path(tmpdir) / "small_thumb.pdf"
-            result_path = generator.generate(
-                result, output_path, thumbnail_size="small"
-            )
+        output_path = tmp_path / "small_thumb.pdf"
+        result_path = generator.generate(
+            result, output_path, thumbnail_size="small"
+        )
 
-            assert result_path.exists()
+        assert result_path.exists()
 
-    def test_generate_graphic_full_thumbnail(self, generator, sample_png):
+    @pytest.mark.slow
+    def test_generate_graphic_full_thumbnail(self, generator, sample_png, tmp_path):
         """Test generating PDF with full-width thumbnail."""
-        from src.analyzer import AnalysisResult
-
         result = AnalysisResult(
             text="",
             categories=["Screenshot"],
@@ -223,18 +228,43 @@ class TestPDFGenerator:
             source_image_path=sample_png,
         )
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = Path(tmpdir) / "full_thumb.pdf"
-            result_path = generator.generate(
-                result, output_path, thumbnail_size="full"
-            )
+        output_path = tmp_path / "full_thumb.pdf"
+        result_path = generator.generate(
+            result, output_path, thumbnail_size="full"
+        )
 
-            assert result_path.exists()
+        assert result_path.exists()
 
-    def test_generate_graphic_no_source_image(self, generator):
-        """Test graphic content without source image path."""
-        from src.analyzer import AnalysisResult
+    def test_graphic_thumbnail_fits_page_height(self, generator, tmp_path):
+        """Test that tall images are scaled down to fit the page height."""
+        from PIL import Image
+        from reportlab.lib.units import inch
+        from reportlab.platypus import Image as RLImage
 
+        tall = tmp_path / "tall.png"
+        Image.new("RGB", (100, 1000)).save(tall)
+        broken = tmp_path / "broken.png"
+        broken.write_bytes(b"not an image")
+
+        result = AnalysisResult(
+            text="",
+            categories=["Chart"],
+            source_file="tall.png",
+            content_type="graphic",
+            source_image_path=tall,
+        )
+        img = generator._build_graphic_section(result, "medium")[0]
+
+        max_height = generator.page_size[1] - 2 * generator.margin - 2 * inch
+        assert isinstance(img, RLImage)
+        assert img.drawHeight == pytest.approx(max_height)
+        assert img.drawWidth == pytest.approx(max_height / 10)
+
+        result.source_image_path = broken
+        assert generator._build_graphic_section(result, "medium") == []
+
+    def test_generate_graphic_no_source_image(self, generator, tmp_path):
+        """Test graphic content without source image path."""
         result = AnalysisResult(
             text="",
             categories=["Photo"],
@@ -243,8 +273,7 @@ class TestPDFGenerator:
             description="A description without an image.",
         )
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = Path(tmpdir) / "no_image.pdf"
-            result_path = generator.generate(result, output_path)
+        output_path = tmp_path / "no_image.pdf"
+        result_path = generator.generate(result, output_path)
 
-            assert result_path.exists()
+        assert result_path.exists()
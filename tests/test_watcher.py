@@ -1,20 +1,28 @@
 """Tests for watcher module."""
 
-import tempfile
+import threading
 import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from src.watcher import (
+    DEBOUNCE_CACHE_SIZE,
+    ChangeHandler,
+    FileHandler,
+    FolderWatcher,
+    PNGHandler,
+    _is_network_filesystem,
+    _is_supported,
+)
+
 
 class TestFileHandler:
     """Test suite for FileHandler class."""
 
     def test_should_process_png_file(self):
         """Test that PNG files are accepted."""
-        from src.watcher import FileHandler
-
         handler = FileHandler(callback=MagicMock())
 
         assert handler._should_process(Path("test.png"))
@@ -22,8 +30,6 @@ class TestFileHandler:
 
     def test_should_process_jpg_file(self):
         """Test that JPG files are accepted."""
-        from src.watcher import FileHandler
-
         handler = FileHandler(callback=MagicMock())
 
         assert handler._should_process(Path("test.jpg"))
@@ -31,86 +37,249 @@ class TestFileHandler:
 
     def test_should_process_pdf_file(self):
         """Test that PDF files are accepted."""
-        from src.watcher import FileHandler
-
         handler = FileHandler(callback=MagicMock())
 
         assert handler._should_process(Path("test.pdf"))
 
-    def test_should_not_process_unsupported(self):
-        """Test that unsupported files are rejected."""
-        from src.watcher import FileHandler
-
-        handler = FileHandler(callback=MagicMock())
+    def test_on_created_ignores_unsupported(self):
+        """Test that unsupported files are never scheduled."""
+        callback = MagicMock()
+        handler = FileHandler(callback=callback, settle_seconds=60)
+
+        for name in (
+            "test.txt", "test.doc", "test.bmp", "shot.png.part", "png", ".png"
+        ):
+            event = MagicMock()
+            event.is_directory = False
+            event.src_path = f"/some/path/{name}"
+            handler.on_created(event)
 
-        assert not handler._should_process(Path("test.txt"))
-        assert not handler._should_process(Path("test.doc"))
-        assert not handler._should_process(Path("test.bmp"))
+        assert not handler._dispatcher._due
+        callback.assert_not_called()
+        handler.close()
+
+    def test_is_supported_needs_a_real_extension(self):
+        """Test that names which only look like an extension are rejected."""
+        assert _is_supported("/some/path/shot.png")
+        assert _is_supported("/some/path/.hidden.PNG")
+        assert _is_supported("shot.jpeg")
+
+        # No dot at all: the whole name would otherwise be the "extension"
+        assert not _is_supported("/some/path/png")
+        assert not _is_supported("pdf")
+        # Dotfiles have no extension
+        assert not _is_supported("/some/path/.png")
+        assert not _is_supported(".jpg")
+        assert not _is_supported("/some/dir.png/readme")
 
     def test_png_handler_alias(self):
         """Test that PNGHandler is still available as alias."""
-        from src.watcher import FileHandler, PNGHandler
-
         assert PNGHandler is FileHandler
 
     def test_debounce_same_file(self):
-        """Test that same file is debounced."""
-        from src.watcher import FileHandler
-
-        handler = FileHandler(callback=MagicMock(), debounce_seconds=1.0)
+        """Test that same file is debounced until the interval has passed."""
+        now = [100.0]
+        handler = FileHandler(
+            callback=MagicMock(), debounce_seconds=1.0, clock=lambda: now[0]
+        )
 
         # First call should be processed
         assert handler._should_process(Path("test.png"))
 
-        # Immediate second call should be debounced
+        # Second call within the interval should be debounced
+        now[0] += 0.9
         assert not handler._should_process(Path("test.png"))
 
+        now[0] += 1.0
+        assert handler._should_process(Path("test.png"))
+
     def test_debounce_different_files(self):
         """Test that different files are not debounced."""
-        from src.watcher import FileHandler
-
-        handler = FileHandler(callback=MagicMock(), debounce_seconds=1.0)
+        handler = FileHandler(
+            callback=MagicMock(), debounce_seconds=1.0, clock=lambda: 100.0
+        )
 
         assert handler._should_process(Path("test1.png"))
         assert handler._should_process(Path("test2.png"))
 
+    def test_debounce_cache_is_bounded(self):
+        """Test that only the most recently seen files are remembered."""
+        handler = FileHandler(callback=MagicMock(), debounce_seconds=60)
+
+        for i in range(DEBOUNCE_CACHE_SIZE + 1):
+            assert handler._should_process(Path(f"shot{i}.png"))
+
+        assert len(handler._last_processed) == DEBOUNCE_CACHE_SIZE
+        # The oldest file was evicted, the newest is still debounced
+        assert handler._should_process(Path("shot0.png"))
+        assert not handler._should_process(Path(f"shot{DEBOUNCE_CACHE_SIZE}.png"))
+
     def test_on_created_triggers_callback(self):
         """Test that on_created triggers callback for supported files."""
-        from src.watcher import FileHandler
-
-        callback = MagicMock()
-        handler = FileHandler(callback=callback, debounce_seconds=0)
+        called = threading.Event()
+        callback = MagicMock(side_effect=lambda path: called.set())
+        handler = FileHandler(callback=callback, debounce_seconds=0, settle_seconds=0)
 
         # Create mock event
         event = MagicMock()
         event.is_directory = False
         event.src_path = "/some/path/test.png"
 
-        with patch("src.watcher.time.sleep"):  # Skip the 0.5s delay
-            handler.on_created(event)
+        handler.on_created(event)
 
-        callback.assert_called_once()
+        assert called.wait(timeout=1)
+        callback.assert_called_once_with(Path("/some/path/test.png"))
+        handler.close()
 
     def test_on_created_triggers_for_jpg(self):
         """Test that on_created triggers callback for JPG files."""
-        from src.watcher import FileHandler
+        called = threading.Event()
+        callback = MagicMock(side_effect=lambda path: called.set())
+        handler = FileHandler(callback=callback, debounce_seconds=0, settle_seconds=0)
+
+        event = MagicMock()
+        event.is_directory = False
+        event.src_path = "/some/path/photo.jpg"
+
+        handler.on_created(event)
 
+        assert called.wait(timeout=1)
+        callback.assert_called_once_with(Path("/some/path/photo.jpg"))
+        handler.close()
+
+    def test_on_created_does_not_wait_for_settle_delay(self):
+        """Test that the event thread is not blocked while a file settles."""
         callback = MagicMock()
-        handler = FileHandler(callback=callback, debounce_seconds=0)
+        handler = FileHandler(callback=callback, debounce_seconds=0, settle_seconds=10)
 
         event = MagicMock()
         event.is_directory = False
-        event.src_path = "/some/path/photo.jpg"
+        event.src_path = "/some/path/test.png"
 
-        with patch("src.watcher.time.sleep"):
-            handler.on_created(event)
+        start = time.monotonic()
+        handler.on_created(event)
+
+        assert time.monotonic() - start < 1
+        callback.assert_not_called()
+        handler.close()
+
+    def test_waits_for_file_size_to_settle(self, tmp_path):
+        """Test that a file is only handed on once it stops growing."""
+        called = threading.Event()
+        callback = MagicMock(side_effect=lambda path: called.set())
+        handler = FileHandler(
+            callback=callback,
+            debounce_seconds=0,
+            settle_seconds=0.02,
+            max_settle_seconds=5,
+        )
+
+        shot = tmp_path / "shot.png"
+        shot.touch()
+        event = MagicMock()
+        event.is_directory = False
+        event.src_path = str(shot)
+
+        handler.on_created(event)
+
+        # Empty files are still being written
+        assert not called.wait(timeout=0.2)
+        shot.write_bytes(b"\x89PNG")
+        assert called.wait(timeout=1)
+        callback.assert_called_once_with(shot)
+        handler.close()
+
+    def test_close_after_write_skips_size_checks(self, tmp_path):
+        """Test that a file is handed on as soon as its writer closes it."""
+        called = threading.Event()
+        callback = MagicMock(side_effect=lambda path: called.set())
+        handler = FileHandler(callback=callback, debounce_seconds=0, settle_seconds=10)
+
+        shot = tmp_path / "shot.png"
+        shot.write_bytes(b"\x89PNG")
+        event = MagicMock()
+        event.is_directory = False
+        event.src_path = str(shot)
+
+        handler.on_created(event)
+        handler.on_closed(event)
+
+        assert called.wait(timeout=1)
+        callback.assert_called_once_with(shot)
+        handler.close()
+
+    def test_event_burst_triggers_one_callback(self):
+        """Test that a burst of events for one file is reported once, at the end."""
+        called = threading.Event()
+        callback = MagicMock(side_effect=lambda path: called.set())
+        handler = FileHandler(callback=callback, debounce_seconds=0, settle_seconds=0.2)
+
+        event = MagicMock()
+        event.is_directory = False
+        event.src_path = "/some/path/test.png"
+
+        handler.on_created(event)
+        for _ in range(3):
+            time.sleep(0.1)
+            handler.on_modified(event)
+        last_event = time.monotonic()
+
+        assert called.wait(timeout=2)
+        assert time.monotonic() - last_event >= 0.2
+        time.sleep(0.3)
+        callback.assert_called_once_with(Path("/some/path/test.png"))
+        handler.close()
+
+    def test_rename_while_settling_reports_new_name(self):
+        """Test that a file renamed before it settles is reported once."""
+        called = threading.Event()
+        callback = MagicMock(side_effect=lambda path: called.set())
+        handler = FileHandler(callback=callback, debounce_seconds=0, settle_seconds=0.1)
+
+        created = MagicMock()
+        created.is_directory = False
+        created.src_path = "/some/path/tmp.png"
+        moved = MagicMock()
+        moved.is_directory = False
+        moved.src_path = "/some/path/tmp.png"
+        moved.dest_path = "/some/path/shot.png"
+
+        handler.on_created(created)
+        handler.on_moved(moved)
+
+        assert called.wait(timeout=1)
+        time.sleep(0.2)
+        callback.assert_called_once_with(Path("/some/path/shot.png"))
+        handler.close()
+
+    def test_executor_handles_files_concurrently(self):
+        """Test that callbacks run on the executor, overlapping each other."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        barrier = threading.Barrier(2, timeout=5)
+        done = threading.Semaphore(0)
+
+        def callback(path):
+            # Only returns once both files are being handled at once
+            barrier.wait()
+            done.release()
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            handler = FileHandler(
+                callback=callback, debounce_seconds=0, settle_seconds=0, executor=pool
+            )
+            for name in ("a.png", "b.png"):
+                event = MagicMock()
+                event.is_directory = False
+                event.src_path = f"/some/path/{name}"
+                handler.on_created(event)
 
-        callback.assert_called_once()
+            assert done.acquire(timeout=5)
+            assert done.acquire(timeout=5)
+            handler.close()
 
     def test_on_created_ignores_directories(self):
         """Test that directories are ignored."""
-        from src.watcher import FileHandler
-
         callback = MagicMock()
         handler = FileHandler(callback=callback)
 
@@ -124,51 +293,93 @@ class TestFileHandler:
 
     def test_on_moved_triggers_callback(self):
         """Test that on_moved triggers callback for supported files."""
-        from src.watcher import FileHandler
+        called = threading.Event()
+        callback = MagicMock(side_effect=lambda path: called.set())
+        handler = FileHandler(callback=callback, debounce_seconds=0, settle_seconds=0)
+
+        event = MagicMock()
+        event.is_directory = False
+        event.src_path = "/some/path/moved.png.part"
+        event.dest_path = "/some/path/moved.png"
+
+        handler.on_moved(event)
+
+        assert called.wait(timeout=1)
+        callback.assert_called_once_with(Path("/some/path/moved.png"))
+        handler.close()
+
+
+class TestChangeHandler:
+    """Test suite for ChangeHandler class."""
 
+    def test_reports_deletions(self):
+        """Test that deleted supported files are reported."""
         callback = MagicMock()
-        handler = FileHandler(callback=callback, debounce_seconds=0)
+        handler = ChangeHandler(callback=callback)
 
         event = MagicMock()
         event.is_directory = False
-        event.dest_path = "/some/path/moved.png"
+        event.src_path = "/some/path/gone.png"
+
+        handler.on_deleted(event)
 
-        with patch("src.watcher.time.sleep"):
-            handler.on_moved(event)
+        callback.assert_called_once_with(Path("/some/path/gone.png"))
 
-        callback.assert_called_once()
+    def test_ignores_unsupported_files(self):
+        """Test that changes to unsupported files are ignored."""
+        callback = MagicMock()
+        handler = ChangeHandler(callback=callback)
+
+        event = MagicMock()
+        event.is_directory = False
+        event.src_path = "/some/path/notes.txt"
+
+        handler.on_created(event)
+        handler.on_modified(event)
+
+        callback.assert_not_called()
+
+    def test_moved_reports_both_paths(self):
+        """Test that a rename reports the old and the new name."""
+        callback = MagicMock()
+        handler = ChangeHandler(callback=callback)
+
+        event = MagicMock()
+        event.is_directory = False
+        event.src_path = "/some/path/old.png"
+        event.dest_path = "/some/path/new.png"
+
+        handler.on_moved(event)
+
+        assert callback.call_count == 2
 
 
 class TestFolderWatcher:
     """Test suite for FolderWatcher class."""
 
     @pytest.fixture
-    def temp_input_dir(self):
+    def temp_input_dir(self, tmp_path):
         """Create temporary input directory."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            yield Path(tmpdir)
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        return input_dir
 
-    def test_creates_input_folder(self):
+    def test_creates_input_folder(self, tmp_path):
         """Test that start creates input folder if missing."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            input_folder = Path(tmpdir) / "new_input"
-
-            from src.watcher import FolderWatcher
+        input_folder = tmp_path / "new_input"
 
-            watcher = FolderWatcher(
-                input_folder=input_folder,
-                callback=MagicMock(),
-            )
+        watcher = FolderWatcher(
+            input_folder=input_folder,
+            callback=MagicMock(),
+        )
 
-            watcher.start()
-            watcher.stop()
+        watcher.start()
+        watcher.stop()
 
-            assert input_folder.exists()
+        assert input_folder.exists()
 
     def test_process_existing_empty(self, temp_input_dir):
         """Test process_existing with empty folder."""
-        from src.watcher import FolderWatcher
-
         callback = MagicMock()
         watcher = FolderWatcher(
             input_folder=temp_input_dir,
@@ -186,18 +397,16 @@ class TestFolderWatcher:
         (temp_input_dir / "test1.png").touch()
         (temp_input_dir / "test2.png").touch()
 
-        from src.watcher import FolderWatcher
-
-        callback = MagicMock()
+        seen = []
         watcher = FolderWatcher(
             input_folder=temp_input_dir,
-            callback=callback,
+            callback=seen.append,
         )
 
         count = watcher.process_existing()
 
         assert count == 2
-        assert callback.call_count == 2
+        assert sorted(path.name for path in seen) == ["test1.png", "test2.png"]
 
     def test_process_existing_multi_format(self, temp_input_dir):
         """Test process_existing with multiple file formats."""
@@ -206,23 +415,41 @@ class TestFolderWatcher:
         (temp_input_dir / "test3.pdf").touch()
         (temp_input_dir / "test4.txt").touch()  # Should be ignored
 
-        from src.watcher import FolderWatcher
-
-        callback = MagicMock()
+        seen = []
         watcher = FolderWatcher(
             input_folder=temp_input_dir,
-            callback=callback,
+            callback=seen.append,
         )
 
         count = watcher.process_existing()
 
         assert count == 3
-        assert callback.call_count == 3
+        assert sorted(path.name for path in seen) == [
+            "test1.png",
+            "test2.jpg",
+            "test3.pdf",
+        ]
+
+    def test_process_existing_concurrently(self, temp_input_dir):
+        """Test that existing files can be handed to the callback in parallel."""
+        for i in range(4):
+            (temp_input_dir / f"shot{i}.png").touch()
+
+        barrier = threading.Barrier(4, timeout=5)
+        seen = []
+
+        def callback(path):
+            # Only returns once all four files are being handled at once
+            barrier.wait()
+            seen.append(path.name)
+
+        watcher = FolderWatcher(input_folder=temp_input_dir, callback=callback)
+
+        assert watcher.process_existing(concurrency=4) == 4
+        assert sorted(seen) == [f"shot{i}.png" for i in range(4)]
 
     def test_start_and_stop(self, temp_input_dir):
         """Test starting and stopping the watcher."""
-        from src.watcher import FolderWatcher
-
         watcher = FolderWatcher(
             input_folder=temp_input_dir,
             callback=MagicMock(),
@@ -234,42 +461,113 @@ class TestFolderWatcher:
         watcher.stop()
         assert not watcher._running
 
-    def test_set_input_folder(self, temp_input_dir):
-        """Test hot-swapping the watched directory."""
-        from src.watcher import FolderWatcher
+    def test_watchers_share_one_observer(self, temp_input_dir):
+        """Test that stopping one of two watchers on a folder keeps the other."""
+        changed = threading.Event()
+        first = FolderWatcher(
+            input_folder=temp_input_dir, callback=MagicMock(), report_all_changes=True
+        )
+        second = FolderWatcher(
+            input_folder=temp_input_dir,
+            callback=lambda path: changed.set(),
+            report_all_changes=True,
+        )
 
-        with tempfile.TemporaryDirectory() as new_dir:
-            new_folder = Path(new_dir)
+        first.start()
+        second.start()
+        assert first.observer is second.observer
 
-            watcher = FolderWatcher(
-                input_folder=temp_input_dir,
-                callback=MagicMock(),
-            )
+        first.stop()
+        (temp_input_dir / "shot.png").write_bytes(b"data")
 
-            assert watcher.input_folder == temp_input_dir
+        assert changed.wait(timeout=5)
+        second.stop()
 
-            watcher.set_input_folder(new_folder)
+    def test_use_polling_observer(self, temp_input_dir):
+        """Test that use_polling swaps in watchdog's polling observer."""
+        from watchdog.observers.polling import PollingObserver
 
-            assert watcher.input_folder == new_folder
+        watcher = FolderWatcher(
+            input_folder=temp_input_dir,
+            callback=MagicMock(),
+            polling_interval=1,
+            use_polling=True,
+        )
 
-    def test_set_input_folder_restarts_if_running(self, temp_input_dir):
-        """Test that set_input_folder restarts watcher if it was running."""
-        from src.watcher import FolderWatcher
+        watcher.start()
+        assert isinstance(watcher.observer, PollingObserver)
+        watcher.stop()
 
-        with tempfile.TemporaryDirectory() as new_dir:
-            new_folder = Path(new_dir)
+    def test_network_mount_detection(self, tmp_path):
+        """Test that folders on network mounts are recognised from the mount table."""
+        mounts = tmp_path / "mounts"
+        mounts.write_text(
+            "/dev/sda1 / ext4 rw 0 0\n"
+            "server:/share /mnt/nas nfs4 rw 0 0\n"
+            "//host/My\\040Docs /mnt/my\\040docs cifs rw 0 0\n"
+            "tmpfs /mnt/nas/local tmpfs rw 0 0\n"
+        )
 
-            watcher = FolderWatcher(
-                input_folder=temp_input_dir,
-                callback=MagicMock(),
-            )
+        with patch("src.watcher._MOUNTS_FILE", str(mounts)):
+            assert _is_network_filesystem(Path("/mnt/nas/shots"))
+            assert _is_network_filesystem(Path("/mnt/my docs"))
+            assert not _is_network_filesystem(Path("/mnt/nas/local/shots"))
+            assert not _is_network_filesystem(Path("/mnt/nasty"))
+            assert not _is_network_filesystem(Path("/home/user/input"))
 
-            watcher.start()
-            assert watcher._running
+        with patch("src.watcher._MOUNTS_FILE", str(tmp_path / "missing")):
+            assert not _is_network_filesystem(Path("/mnt/nas/shots"))
 
-            watcher.set_input_folder(new_folder)
+    def test_run_forever_returns_when_stopped(self, temp_input_dir):
+        """Test that stop() from another thread ends run_forever promptly."""
+        watcher = FolderWatcher(
+            input_folder=temp_input_dir,
+            callback=MagicMock(),
+            polling_interval=60,
+        )
+        watcher.start()
+
+        timer = threading.Timer(0.1, watcher.stop)
+        timer.start()
+        start = time.monotonic()
+        watcher.run_forever()
 
-            assert watcher._running
-            assert watcher.input_folder == new_folder
+        assert time.monotonic() - start < 5
+        assert not watcher._running
+        timer.join()
+
+    def test_set_input_folder(self, temp_input_dir, tmp_path):
+        """Test hot-swapping the watched directory."""
+        new_folder = tmp_path / "new_input"
+        new_folder.mkdir()
 
-            watcher.stop()
+        watcher = FolderWatcher(
+            input_folder=temp_input_dir,
+            callback=MagicMock(),
+        )
+
+        assert watcher.input_folder == temp_input_dir.resolve()
+
+        watcher.set_input_folder(new_folder)
+
+        assert watcher.input_folder == new_folder.resolve()
+
+    def test_set_input_folder_restarts_if_running(self, temp_input_dir, tmp_path):
+        """Test that set_input_folder restarts watcher if it was running."""
+        new_folder = tmp_path / "new_input"
+        new_folder.mkdir()
+
+        watcher = FolderWatcher(
+            input_folder=temp_input_dir,
+            callback=MagicMock(),
+        )
+
+        watcher.start()
+        assert watcher._running
+
+        watcher.set_input_folder(new_folder)
+
+        assert watcher._running
+        assert watcher.input_folder == new_folder.resolve()
+
+        watcher.stop()